@@ -4,7 +4,6 @@ import os
 
 import uvicorn
 from dotenv import load_dotenv
-from openai.types.chat import ChatCompletionSystemMessageParam, ChatCompletionUserMessageParam
 
 load_dotenv()
 
@@ -181,8 +180,8 @@ Provide your evaluation with scores for each criterion for both debaters.
         completion = self._client.beta.chat.completions.parse(
             model=self._model,
             messages=[
-                ChatCompletionSystemMessageParam(content=system_prompt, role="system"),
-                ChatCompletionUserMessageParam(content=judge_prompt, role="user"),
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": judge_prompt},
             ],
             response_format=DebateEval,
         )
@@ -6,7 +6,6 @@ import os
 
 import uvicorn
 from dotenv import load_dotenv
-from openai.types.chat import ChatCompletionSystemMessageParam, ChatCompletionUserMessageParam
 
 load_dotenv()
 
@@ -172,8 +171,8 @@ class DebateJudge(GreenAgent):
         completion = self._client.beta.chat.completions.parse(
             model=self._model,
             messages=[
-                ChatCompletionSystemMessageParam(content=system_prompt, role="system"),
-                ChatCompletionUserMessageParam(content=user_prompt, role="user"),
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
             ],
             response_format=DebateEval,
         )
@@ -2,10 +2,10 @@ from pydantic import BaseModel
 from typing import Literal
 
 from a2a.types import (
-    AgentCapabilities,
     AgentCard,
     AgentSkill,
 )
+from agentbeats.agent_card import streaming_capabilities, text_modes
 
 
 class DebaterScore(BaseModel):
@@ -46,9 +46,9 @@ def debate_judge_agent_card(agent_name: str, card_url: str) -> AgentCard:
         description='Orchestrate and judge a structured debate between pro and con agents on a given topic with multiple rounds of arguments.',
         url=card_url,
         version='1.0.0',
-        default_input_modes=['text'],
-        default_output_modes=['text'],
-        capabilities=AgentCapabilities(streaming=True),
+        default_input_modes=text_modes(),
+        default_output_modes=text_modes(),
+        capabilities=streaming_capabilities(),
         skills=[skill],
     )
     return agent_card
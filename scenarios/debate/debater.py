@@ -1,17 +1,23 @@
 import argparse
 import os
-import uvicorn
-from dotenv import load_dotenv
-load_dotenv()
 
-from google.adk.agents import Agent
-from google.adk.models.lite_llm import LiteLlm
-from google.adk.a2a.utils.agent_to_a2a import to_a2a
 
-from a2a.types import (
-    AgentCapabilities,
-    AgentCard,
-)
+def get_agent_card(host: str, port: int, card_url: str | None = None):
+    """Build the debater's agent card without importing ADK or uvicorn"""
+    from a2a.types import AgentCard
+    from agentbeats.agent_card import no_skills, streaming_capabilities, text_modes
+
+    return AgentCard(
+        name="debater",
+        description='Participates in a debate.',
+        url=card_url or f'http://{host}:{port}/',
+        version='1.0.0',
+        default_input_modes=text_modes(),
+        default_output_modes=text_modes(),
+        capabilities=streaming_capabilities(),
+        skills=no_skills(),
+    )
+
 
 def main():
     parser = argparse.ArgumentParser(description="Run the A2A debater agent.")
@@ -23,31 +29,23 @@ def main():
     parser.add_argument("--model", type=str, help="Model to use for the agent")
     args = parser.parse_args()
 
+    # Heavy dependencies are only needed when actually serving
+    import uvicorn
+    from dotenv import load_dotenv
+    from google.adk.agents import Agent
+    from google.adk.a2a.utils.agent_to_a2a import to_a2a
+    from agentbeats.adk_model import build_model
+    from agentbeats.agent_card import serve_static_agent_card
+
+    load_dotenv()
+
     # Get configuration from args or environment
-    api_key = args.api_key or os.getenv("API_KEY")
-    base_url = args.base_url or os.getenv("BASE_URL")
-    model = args.model or os.getenv("DEFAULT_MODEL", "gemini-2.0-flash")
-    azure_api_version = os.getenv("AZURE_OPENAI_API_VERSION")
-    
-    # Configure model based on provider
-    if base_url:
-        # Use LiteLlm for custom providers (Azure OpenAI, OpenAI, etc.)
-        model_config_kwargs = {
-            "model": f"openai/{model}",  # LiteLLM format for OpenAI-compatible APIs
-            "api_key": api_key,
-            "api_base": base_url,
-        }
-        
-        # Add Azure-specific headers if API version is set
-        if azure_api_version:
-            model_config_kwargs["extra_headers"] = {"api-version": azure_api_version}
-        
-        model_config = LiteLlm(**model_config_kwargs)
-    else:
-        # Default to native Gemini with API key
-        if api_key:
-            os.environ["GOOGLE_API_KEY"] = api_key
-        model_config = model
+    model_config = build_model(
+        args.model or os.getenv("DEFAULT_MODEL", "gemini-2.0-flash"),
+        args.api_key or os.getenv("API_KEY"),
+        args.base_url or os.getenv("BASE_URL"),
+        os.getenv("AZURE_OPENAI_API_VERSION"),
+    )
 
     root_agent = Agent(
         name="debater",
@@ -56,19 +54,21 @@ def main():
         instruction="You are a professional debater.",
     )
 
-    agent_card = AgentCard(
-        name="debater",
-        description='Participates in a debate.',
-        url=args.card_url or f'http://{args.host}:{args.port}/',
-        version='1.0.0',
-        default_input_modes=['text'],
-        default_output_modes=['text'],
-        capabilities=AgentCapabilities(streaming=True),
-        skills=[],
-    )
+    agent_card = get_agent_card(args.host, args.port, args.card_url)
 
     a2a_app = to_a2a(root_agent, agent_card=agent_card)
-    uvicorn.run(a2a_app, host=args.host, port=args.port)
+    # The card never changes after startup, so serialize it once
+    serve_static_agent_card(a2a_app, agent_card)
+    # "auto" picks uvloop and the httptools parser when installed (uvicorn[standard]),
+    # falling back to asyncio / h11 where they aren't (e.g. uvloop on Windows)
+    uvicorn.run(
+        a2a_app,
+        host=args.host,
+        port=args.port,
+        loop="auto",
+        http="auto",
+        log_level="warning",
+    )
 
 
 if __name__ == "__main__":
@@ -1,17 +1,20 @@
 from typing import Literal
 
 from a2a.types import (
-    AgentCapabilities,
     AgentCard,
     AgentSkill,
 )
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from typing_extensions import TypedDict  # Pydantic requires typing_extensions.TypedDict on Python < 3.12
+
+from agentbeats.agent_card import streaming_capabilities, text_modes
 
 
 # ==================== Data Models ====================
 
 class CriterionEvaluation(BaseModel):
     """Evaluation of a single criterion"""
+    model_config = ConfigDict(frozen=True)
     criterion_id: int  # Criterion number from CSV (1-30)
     criterion_text: str  # The criterion being evaluated
     category: str  # "Empathy", "Persuasion", or "Safety"
@@ -20,6 +23,7 @@ class CriterionEvaluation(BaseModel):
 
 class PatientPersona(BaseModel):
     """Minimal patient persona config - details generated dynamically"""
+    model_config = ConfigDict(frozen=True)
     persona_id: str  # e.g., "INTJ_PNEUMO" or "INTJ_M_PNEUMO"
     mbti_type: str  # MBTI personality type (16 options: INTJ, ESFP, etc.)
     gender: str | None = None  # "male" or "female" (optional - can be generated)
@@ -29,6 +33,7 @@ class PatientPersona(BaseModel):
 
 class PatientRoleplayExamples(BaseModel):
     """Generated roleplay examples for context priming"""
+    model_config = ConfigDict(frozen=True)
     role_core_description: str  # Detailed character description (goes in USER message, not system)
     role_acknowledgement_phrase: str  # Acknowledgement after receiving core description
     role_rules_and_constraints: str  # Rules and constraints for staying in character
@@ -40,6 +45,7 @@ class PatientRoleplayExamples(BaseModel):
 
 class PatientBackground(BaseModel):
     """Full patient background info generated for simulation (superset of clinical info)"""
+    model_config = ConfigDict(frozen=True)
     # Basic demographics
     age: int  # Patient age (35-65 range)
     gender: str  # "male" or "female" (generated if not specified)
@@ -69,6 +75,7 @@ class PatientClinicalInfo(BaseModel):
     a real doctor would have access to in a clinical setting.
     Does NOT include: symptoms (patient reports these), personality, concerns, lifestyle.
     """
+    model_config = ConfigDict(frozen=True)
     age: int  # Patient age
     gender: str | None = None  # "male" or "female" (optional for privacy)
     medical_case: str  # "pneumothorax" or "lung_cancer"
@@ -98,30 +105,37 @@ class RoundEvaluation(BaseModel):
     stop_reason: str | None  # "patient_left" | "patient_accepted" | "max_rounds_reached" | null
 
 
-class DialogueTurn(BaseModel):
-    """Single turn in doctor-patient dialogue with per-round evaluation"""
+class DialogueTurn(TypedDict):
+    """Single turn in doctor-patient dialogue with per-round evaluation
+    
+    Plain dict record written on every turn; validated once via MedicalEvalResult.
+    """
     turn_number: int  # Sequential turn number in dialogue
     speaker: Literal["doctor", "patient"]  # Speaker identifier
     message: str  # Dialogue message content
     timestamp: str  # ISO 8601 timestamp
-    round_evaluation: RoundEvaluation | None = None  # Evaluation results if round complete
+    round_evaluation: RoundEvaluation | None  # Evaluation results if round complete
 
 
-class DialogueSession(BaseModel):
-    """Complete dialogue session record with per-round evaluations"""
+class DialogueSession(TypedDict):
+    """Complete dialogue session record with per-round evaluations
+    
+    Plain dict record updated during the dialogue; validated once via MedicalEvalResult.
+    """
     session_id: str  # Unique session identifier
     persona_id: str  # Patient persona identifier
     doctor_agent_url: str  # Purple agent endpoint
     start_time: str  # ISO 8601 timestamp
-    end_time: str | None = None  # ISO 8601 timestamp
-    turns: list[DialogueTurn] = []  # All dialogue turns
-    total_rounds: int = 0  # Number of complete rounds
-    final_outcome: str | None = None  # "patient_accepted" | "patient_left" | "max_rounds_reached"
-    stop_reason: str | None = None  # Why dialogue terminated
+    end_time: str | None  # ISO 8601 timestamp
+    turns: list[DialogueTurn]  # All dialogue turns
+    total_rounds: int  # Number of complete rounds
+    final_outcome: str | None  # "patient_accepted" | "patient_left" | "max_rounds_reached"
+    stop_reason: str | None  # Why dialogue terminated
 
 
 class PerformanceReport(BaseModel):
     """Comprehensive final report with per-round and overall scores"""
+    model_config = ConfigDict(frozen=True)
     session_id: str  # Reference to DialogueSession
     final_outcome: str  # "patient_accepted" | "patient_left" | "max_rounds_reached"
     total_rounds: int  # Number of rounds completed
@@ -150,6 +164,7 @@ class PerformanceReport(BaseModel):
 
 class MedicalEvalResult(BaseModel):
     """Complete evaluation results across multiple personas"""
+    model_config = ConfigDict(frozen=True)
     assessment_id: str  # Unique assessment identifier
     doctor_agent_url: str  # Evaluated purple agent
     timestamp: str  # ISO 8601 timestamp
@@ -195,9 +210,9 @@ def medical_judge_agent_card(agent_name: str, card_url: str) -> AgentCard:
         description='Evaluates doctor agents ability to persuade patients to accept surgical treatment across diverse patient personas (16 MBTI types × 2 genders × 2 medical conditions).',
         url=card_url,
         version='1.0.0',
-        default_input_modes=['text'],
-        default_output_modes=['text'],
-        capabilities=AgentCapabilities(streaming=True),
+        default_input_modes=text_modes(),
+        default_output_modes=text_modes(),
+        capabilities=streaming_capabilities(),
         skills=[skill],
     )
     return agent_card
@@ -8,11 +8,13 @@ import contextlib
 import logging
 import os
 from datetime import datetime
+from typing import Any, Awaitable, Callable
 from uuid import uuid4
 
+import httpx
 import uvicorn
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
 
 load_dotenv()
 
@@ -32,13 +34,16 @@ from common import (
     DialogueSession,
     DialogueTurn,
     PerformanceReport,
+    PatientPersona,
+    PatientBackground,
     PatientClinicalInfo,
+    PatientRoleplayExamples,
     medical_judge_agent_card
 )
-from persona_manager import PersonaManager
+from persona_manager import get_default_manager
 from patient_constructor import PatientConstructor
-from patient_agent import PatientAgent
-from per_round_scoring import PerRoundScoringEngine
+from patient_agent import AsyncPatientAgent, PatientAgent
+from per_round_scoring import CRITERIA_VOTES, PerRoundScoringEngine
 from stop_detector import StopConditionDetector
 from report_generator import ReportGenerator
 
@@ -46,6 +51,14 @@ from report_generator import ReportGenerator
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("medical_judge")
 
+# Connection pool shared by every PatientAgent / judge component using a client:
+# long-lived keep-alive HTTP/2 connections so calls reuse the TLS session
+HTTP_CLIENT_KWARGS = {
+    "limits": httpx.Limits(max_connections=128, max_keepalive_connections=64, keepalive_expiry=60),
+    "timeout": httpx.Timeout(120.0, connect=5.0),
+    "http2": True,
+}
+
 
 class MedicalJudge(GreenAgent):
     """
@@ -61,19 +74,50 @@ class MedicalJudge(GreenAgent):
     Uses base EvalRequest from agentbeats for compatibility
     """
     
-    def __init__(self, judge_client: OpenAI, judge_model: str, patient_client: OpenAI = None, patient_model: str = None):
+    def __init__(
+        self,
+        judge_client: OpenAI,
+        judge_model: str,
+        judge_async_client: AsyncOpenAI,
+        patient_client: OpenAI | None = None,
+        patient_model: str | None = None,
+        patient_async_client: AsyncOpenAI | None = None
+    ):
+        """
+        Initialize MedicalJudge
+        
+        Args:
+            judge_client: OpenAI client for the stop detector and report generator
+            judge_model: Model name for all judge calls
+            judge_async_client: AsyncOpenAI client for per-round scoring (required; scoring
+                calls run concurrently) and for persona construction if no patient async client
+            patient_client: OpenAI client for the patient (defaults to judge_client)
+            patient_model: Model name for the patient (defaults to judge_model)
+            patient_async_client: AsyncOpenAI client for the patient; enables the async patient
+                agent and is used for persona construction
+        """
         self.patient_max_retries = 3
         self.patient_retry_delay = 2
         self.judge_max_retries = 5
         self.judge_retry_delay = 3
         self.passing_score_threshold = 70
+        self.max_concurrency = 4
+        self.judge_max_concurrent_requests = 8
+        self.judge_history_token_budget = 2000
+        self.judge_criteria_votes = CRITERIA_VOTES
+        self.patient_history_compaction_threshold = 0
+        self.patient_summary_model = None
+        self.patient_stream_usage = False
         self._required_roles = ["doctor"]
         self._required_config_keys = ["persona_ids", "max_rounds"]
         self._judge_client = judge_client
+        self._judge_async_client = judge_async_client
         self._patient_client = patient_client or judge_client
+        self._patient_async_client = patient_async_client
+        # Persona construction is async-only; fall back to the judge's async client
+        self._constructor_client = patient_async_client or judge_async_client
         self._judge_model = judge_model
         self._patient_model = patient_model or judge_model
-        self._tool_provider = ToolProvider()
         
         # Path to criteria CSV file
         self.criteria_csv_path = os.path.join(
@@ -82,9 +126,9 @@ class MedicalJudge(GreenAgent):
         )
         
         # Initialize components (retry config will be set via configure_retry_settings)
-        self.persona_manager = PersonaManager()
-        self.patient_constructor = PatientConstructor(self._patient_client, self._patient_model, self.persona_manager)
-        self.scoring_engine = PerRoundScoringEngine(self._judge_client, self._judge_model, self.criteria_csv_path)
+        self.persona_manager = get_default_manager()
+        self.patient_constructor = PatientConstructor(self._constructor_client, self._patient_model, self.persona_manager)
+        self.scoring_engine = PerRoundScoringEngine(self._judge_async_client, self._judge_model, self.criteria_csv_path)
         self.stop_detector = StopConditionDetector(self._judge_client, self._judge_model)
         self.report_generator = ReportGenerator(self._judge_client, self._judge_model)
         
@@ -108,11 +152,41 @@ class MedicalJudge(GreenAgent):
         # Get passing score threshold from config
         self.passing_score_threshold = config.get("passing_score_threshold", 70)
         
+        # Get number of persona sessions evaluated concurrently
+        self.max_concurrency = max(1, int(config.get("max_concurrency", 4)))
+        
+        # Get cap on in-flight per-round scoring calls (shared by all sessions)
+        self.judge_max_concurrent_requests = max(1, int(config.get("judge_max_concurrent_requests", 8)))
+        
+        # Get token budget for the dialogue history sent with each scoring call (0 = full history)
+        self.judge_history_token_budget = int(config.get("judge_history_token_budget", 2000))
+        
+        # Get number of completions majority-voted per criteria evaluation (1 = single completion)
+        self.judge_criteria_votes = max(1, int(config.get("judge_criteria_votes", CRITERIA_VOTES)))
+        
+        # Get patient history compaction settings (threshold 0 keeps the full history)
+        self.patient_history_compaction_threshold = int(config.get("patient_history_compaction_threshold", 0))
+        self.patient_summary_model = config.get("patient_summary_model")
+        
+        # Get whether streamed patient responses request token usage (off: some backends reject it)
+        self.patient_stream_usage = bool(config.get("patient_stream_usage", False))
+        
+        # Recreate patient constructor with the optional persona disk cache and rendering mode
+        self.patient_constructor = PatientConstructor(
+            self._constructor_client, self._patient_model, self.persona_manager,
+            cache_dir=config.get("persona_cache_dir"),
+            max_concurrency=self.max_concurrency,
+            use_llm_rendering=bool(config.get("persona_llm_rendering", False))
+        )
+        
         # Recreate judge components with new retry settings
         self.scoring_engine = PerRoundScoringEngine(
-            self._judge_client, self._judge_model, self.criteria_csv_path,
+            self._judge_async_client, self._judge_model, self.criteria_csv_path,
             max_retries=self.judge_max_retries, 
-            retry_delay=self.judge_retry_delay
+            retry_delay=self.judge_retry_delay,
+            max_concurrent_requests=self.judge_max_concurrent_requests,
+            history_token_budget=self.judge_history_token_budget,
+            criteria_votes=self.judge_criteria_votes
         )
         self.stop_detector = StopConditionDetector(
             self._judge_client, self._judge_model,
@@ -152,21 +226,30 @@ class MedicalJudge(GreenAgent):
         # Configure retry settings from TOML config
         self.configure_retry_settings(req.config)
         
-        try:
-            doctor_url = str(req.participants["doctor"])
-            max_rounds = int(req.config["max_rounds"])
-            persona_ids = self.persona_manager.expand_persona_ids(req.config["persona_ids"])
-            
-            await updater.update_status(
-                TaskState.working,
-                new_agent_text_message(f"Evaluating {len(persona_ids)} personas with max {max_rounds} rounds each")
+        doctor_url = str(req.participants["doctor"])
+        max_rounds = int(req.config["max_rounds"])
+        persona_ids = self.persona_manager.expand_persona_ids(req.config["persona_ids"])
+        
+        await updater.update_status(
+            TaskState.working,
+            new_agent_text_message(
+                f"Evaluating {len(persona_ids)} personas with max {max_rounds} rounds each "
+                f"(up to {self.max_concurrency} concurrently)"
             )
-            
-            sessions = []
-            reports = []
-            
-            # Evaluate each persona
-            for idx, persona_id in enumerate(persona_ids, 1):
+        )
+        
+        # Construct all patient personas concurrently before the dialogues start
+        patient_profiles = await self.patient_constructor.construct_patient_personas(persona_ids)
+        
+        # Bound the number of dialogue sessions running at once
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def evaluate_persona(
+            idx: int,
+            persona_id: str,
+            patient_profile: tuple[PatientPersona, PatientBackground, PatientClinicalInfo, PatientRoleplayExamples]
+        ) -> tuple[DialogueSession, PerformanceReport]:
+            async with semaphore:
                 logger.info(f"\n{'='*60}\nEvaluating persona {idx}/{len(persona_ids)}: {persona_id}\n{'='*60}")
                 
                 await updater.update_status(
@@ -177,14 +260,12 @@ class MedicalJudge(GreenAgent):
                 # Run dialogue for this persona
                 session, report = await self.run_dialogue_session(
                     persona_id=persona_id,
+                    patient_profile=patient_profile,
                     doctor_url=doctor_url,
                     max_rounds=max_rounds,
                     updater=updater
                 )
                 
-                sessions.append(session)
-                reports.append(report)
-                
                 await updater.update_status(
                     TaskState.working,
                     new_agent_text_message(
@@ -192,50 +273,66 @@ class MedicalJudge(GreenAgent):
                         f"{report.final_outcome}, score={report.aggregate_score:.1f}"
                     )
                 )
-            
-            # Calculate aggregate statistics
-            mean_score = sum(r.aggregate_score for r in reports) / len(reports)
-            
-            # Generate overall summary
-            overall_summary = self._generate_batch_summary(sessions, reports, mean_score)
-            
-            # Determine winner based on outcomes
-            winner = self._determine_winner(sessions, mean_score)
-            
-            # Create MedicalEvalResult (internal detailed structure)
-            medical_result = MedicalEvalResult(
-                assessment_id=str(uuid4()),
-                doctor_agent_url=doctor_url,
-                timestamp=datetime.now().isoformat(),
-                sessions=sessions,
-                reports=reports,
-                mean_aggregate_score=mean_score,
-                overall_summary=overall_summary
-            )
-            logger.info(f"Medical Evaluation Result:\n{medical_result.model_dump_json(indent=2)}")
-            
-            # Create base EvalResult for compatibility with agentbeats infrastructure
-            result = EvalResult(
-                winner=winner,
-                detail=medical_result.model_dump()
-            )
-            
-            # Add artifacts
-            await updater.add_artifact(
-                parts=[
-                    Part(root=TextPart(text=result.model_dump_json(indent=2))),
-                ],
-                name="Result",
-            )
-            
-            logger.info(f"Evaluation complete! Mean score: {mean_score:.2f}")
-            
-        finally:
-            self._tool_provider.reset()
+                return session, report
+        
+        # Evaluate personas concurrently (results keep persona order); the first failed
+        # session cancels the others, and that error is re-raised rather than the group
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    tg.create_task(evaluate_persona(idx, persona_id, patient_profile))
+                    for idx, (persona_id, patient_profile) in enumerate(zip(persona_ids, patient_profiles), 1)
+                ]
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0]
+        results = [task.result() for task in tasks]
+        sessions = [session for session, _ in results]
+        reports = [report for _, report in results]
+        
+        # Calculate aggregate statistics
+        mean_score = sum(r.aggregate_score for r in reports) / len(reports)
+        
+        # Generate overall summary
+        overall_summary = self._generate_batch_summary(sessions, reports, mean_score)
+        
+        # Determine winner based on outcomes
+        winner = self._determine_winner(sessions, mean_score)
+        
+        # Create MedicalEvalResult (internal detailed structure)
+        medical_result = MedicalEvalResult(
+            assessment_id=str(uuid4()),
+            doctor_agent_url=doctor_url,
+            timestamp=datetime.now().isoformat(),
+            sessions=sessions,
+            reports=reports,
+            mean_aggregate_score=mean_score,
+            overall_summary=overall_summary
+        )
+        
+        # Create base EvalResult for compatibility with agentbeats infrastructure
+        result = EvalResult(
+            winner=winner,
+            detail=medical_result.model_dump()
+        )
+        
+        # Serialize once and reuse for both the log and the artifact
+        result_json = result.model_dump_json(indent=2)
+        logger.info(f"Medical Evaluation Result:\n{result_json}")
+        
+        # Add artifacts
+        await updater.add_artifact(
+            parts=[
+                Part(root=TextPart(text=result_json)),
+            ],
+            name="Result",
+        )
+        
+        logger.info(f"Evaluation complete! Mean score: {mean_score:.2f}")
     
     async def run_dialogue_session(
         self,
         persona_id: str,
+        patient_profile: tuple[PatientPersona, PatientBackground, PatientClinicalInfo, PatientRoleplayExamples],
         doctor_url: str,
         max_rounds: int,
         updater: TaskUpdater
@@ -243,152 +340,168 @@ class MedicalJudge(GreenAgent):
         """
         Run complete dialogue session for one persona
         
+        Args:
+            persona_id: Persona identifier
+            patient_profile: Constructed (persona, background, clinical info, roleplay examples)
+            doctor_url: Doctor agent endpoint
+            max_rounds: Maximum dialogue rounds
+            updater: Task updater for status messages
+        
         Returns:
             tuple: (DialogueSession, PerformanceReport)
         """
         session_id = str(uuid4())
         logger.info(f"Starting dialogue session {session_id} with persona {persona_id}")
         
-        # Construct patient persona (now returns tuple with background, clinical info, and roleplay examples)
-        persona, background, clinical_info, roleplay_examples = self.patient_constructor.construct_patient_persona(persona_id)
+        # Patient persona constructed up front (with background, clinical info, and roleplay examples)
+        persona, background, clinical_info, roleplay_examples = patient_profile
         
         # Initialize patient agent with retry config and roleplay examples
-        patient = PatientAgent(
-            self._patient_client, self._patient_model, persona.character_description,
-            max_retries=self.patient_max_retries,
-            retry_delay=self.patient_retry_delay,
-            use_roleplay_context=True,
-            roleplay_examples=roleplay_examples
-        )
+        patient_respond = self._create_patient(persona.character_description, roleplay_examples)
+        
+        # Each session keeps its own doctor conversation context
+        tool_provider = ToolProvider()
         
         # Create session
-        session = DialogueSession(
-            session_id=session_id,
-            persona_id=persona_id,
-            doctor_agent_url=doctor_url,
-            start_time=datetime.now().isoformat(),
-            turns=[],
-            total_rounds=0
-        )
+        session: DialogueSession = {
+            "session_id": session_id,
+            "persona_id": persona_id,
+            "doctor_agent_url": doctor_url,
+            "start_time": datetime.now().isoformat(),
+            "end_time": None,
+            "turns": [],
+            "total_rounds": 0,
+            "final_outcome": None,
+            "stop_reason": None,
+        }
         
         round_evaluations = []
         
-        # Round-based dialogue loop
-        for round_num in range(1, max_rounds + 1):
-            logger.info(f"\n--- Round {round_num}/{max_rounds} ---")
-            
-            await updater.update_status(
-                TaskState.working,
-                new_agent_text_message(f"  [{persona_id}] Round {round_num}/{max_rounds}")
-            )
-            
-            # === Doctor's turn ===
-            # Send PatientClinicalInfo + dialogue history to doctor
-            doctor_context = self._build_doctor_context(clinical_info, session.turns)
-            
-            logger.info(f"Requesting doctor's response...")
-            doctor_message = await self._tool_provider.talk_to_agent(
-                message=doctor_context,
-                url=doctor_url,
-                new_conversation=(round_num == 1)
-            )
-            
-            # Record doctor's turn
-            doctor_turn = DialogueTurn(
-                turn_number=len(session.turns) + 1,
-                speaker="doctor",
-                message=doctor_message,
-                timestamp=datetime.now().isoformat()
-            )
-            session.turns.append(doctor_turn)
-            
-            logger.info(f"Doctor: {doctor_message[:100]}...")
-            
-            # Show doctor's message in status update
-            await updater.update_status(
-                TaskState.working,
-                new_agent_text_message(f"  Doctor: {doctor_message}")
-            )
-            
-            # === Patient's turn ===
-            logger.info(f"Generating patient response...")
-            patient_response = patient.respond(doctor_message)
-            
-            # Record patient's turn
-            patient_turn = DialogueTurn(
-                turn_number=len(session.turns) + 1,
-                speaker="patient",
-                message=patient_response,
-                timestamp=datetime.now().isoformat()
-            )
-            session.turns.append(patient_turn)
-            
-            logger.info(f"Patient: {patient_response[:100]}...")
-            
-            # Show patient's message in status update
-            await updater.update_status(
-                TaskState.working,
-                new_agent_text_message(f"  Patient: {patient_response}")
-            )
-            
-            # === Per-Round Evaluation ===
-            logger.info(f"Evaluating round {round_num}...")
-            dialogue_history = self._build_dialogue_transcript(session.turns)
-            
-            evaluation = self.scoring_engine.evaluate_round(
-                round_number=round_num,
-                doctor_message=doctor_message,
-                patient_response=patient_response,
-                dialogue_history=dialogue_history,
-                max_rounds=max_rounds
-            )
-            
-            round_evaluations.append(evaluation)
-            patient_turn.round_evaluation = evaluation
-            session.total_rounds = round_num
-            
-            await updater.update_status(
-                TaskState.working,
-                new_agent_text_message(
-                    f"  [{persona_id}] Round {round_num}: E={evaluation.empathy_score:.1f} "
-                    f"P={evaluation.persuasion_score:.1f} S={evaluation.safety_score:.1f}"
+        # Round-based dialogue loop; the doctor conversation is reset even if a round fails
+        try:
+            for round_num in range(1, max_rounds + 1):
+                logger.info(f"\n--- Round {round_num}/{max_rounds} ---")
+                
+                await updater.update_status(
+                    TaskState.working,
+                    new_agent_text_message(f"  [{persona_id}] Round {round_num}/{max_rounds}")
                 )
-            )
-            
-            # === Check Stop Conditions ===
-            logger.info(f"Checking stop conditions...")
-            should_stop, stop_reason = self.stop_detector.should_stop(
-                round_number=round_num,
-                patient_response=patient_response,
-                dialogue_history=dialogue_history,
-                max_rounds=max_rounds
-            )
-            
-            # Update evaluation with stop decision
-            evaluation.should_stop = should_stop
-            evaluation.stop_reason = stop_reason
-            
-            if should_stop:
-                logger.info(f"Stop condition met: {stop_reason}")
-                session.final_outcome = stop_reason
-                session.stop_reason = stop_reason
                 
+                # === Doctor's turn ===
+                # Send PatientClinicalInfo + dialogue history to doctor
+                doctor_context = self._build_doctor_context(clinical_info, session["turns"])
+                
+                logger.info(f"Requesting doctor's response...")
+                doctor_message = await tool_provider.talk_to_agent(
+                    message=doctor_context,
+                    url=doctor_url,
+                    new_conversation=(round_num == 1)
+                )
+                
+                # Record doctor's turn
+                doctor_turn: DialogueTurn = {
+                    "turn_number": len(session["turns"]) + 1,
+                    "speaker": "doctor",
+                    "message": doctor_message,
+                    "timestamp": datetime.now().isoformat(),
+                    "round_evaluation": None,
+                }
+                session["turns"].append(doctor_turn)
+                
+                logger.info(f"Doctor: {doctor_message[:100]}...")
+                
+                # Show doctor's message in status update
                 await updater.update_status(
                     TaskState.working,
-                    new_agent_text_message(f"  [{persona_id}] Dialogue stopped: {stop_reason}")
+                    new_agent_text_message(f"  [{persona_id}] Doctor: {doctor_message}")
                 )
-                break
+                
+                # === Patient's turn ===
+                logger.info(f"Generating patient response...")
+                patient_response = await patient_respond(doctor_message)
+                
+                # Record patient's turn
+                patient_turn: DialogueTurn = {
+                    "turn_number": len(session["turns"]) + 1,
+                    "speaker": "patient",
+                    "message": patient_response,
+                    "timestamp": datetime.now().isoformat(),
+                    "round_evaluation": None,
+                }
+                session["turns"].append(patient_turn)
+                
+                logger.info(f"Patient: {patient_response[:100]}...")
+                
+                # Show patient's message in status update
+                await updater.update_status(
+                    TaskState.working,
+                    new_agent_text_message(f"  [{persona_id}] Patient: {patient_response}")
+                )
+                
+                # === Per-Round Evaluation and Stop Conditions ===
+                # Independent judge calls - the (blocking) stop detector runs in a worker thread
+                # while the scoring engine's requests are in flight
+                logger.info(f"Evaluating round {round_num} and checking stop conditions...")
+                dialogue_history = self._build_dialogue_transcript(session["turns"])
+                
+                evaluation, (should_stop, stop_reason) = await asyncio.gather(
+                    self.scoring_engine.evaluate_round(
+                        round_number=round_num,
+                        doctor_message=doctor_message,
+                        patient_response=patient_response,
+                        dialogue_history=dialogue_history,
+                        max_rounds=max_rounds
+                    ),
+                    asyncio.to_thread(
+                        self.stop_detector.should_stop,
+                        round_number=round_num,
+                        patient_response=patient_response,
+                        dialogue_history=dialogue_history,
+                        max_rounds=max_rounds
+                    )
+                )
+                
+                round_evaluations.append(evaluation)
+                patient_turn["round_evaluation"] = evaluation
+                session["total_rounds"] = round_num
+                
+                await updater.update_status(
+                    TaskState.working,
+                    new_agent_text_message(
+                        f"  [{persona_id}] Round {round_num}: E={evaluation.empathy_score:.1f} "
+                        f"P={evaluation.persuasion_score:.1f} S={evaluation.safety_score:.1f}"
+                    )
+                )
+                
+                # Update evaluation with stop decision
+                evaluation.should_stop = should_stop
+                evaluation.stop_reason = stop_reason
+                
+                if should_stop:
+                    logger.info(f"Stop condition met: {stop_reason}")
+                    session["final_outcome"] = stop_reason
+                    session["stop_reason"] = stop_reason
+                    
+                    await updater.update_status(
+                        TaskState.working,
+                        new_agent_text_message(f"  [{persona_id}] Dialogue stopped: {stop_reason}")
+                    )
+                    break
+        
+        finally:
+            tool_provider.reset()
         
         # Mark session end
-        session.end_time = datetime.now().isoformat()
+        session["end_time"] = datetime.now().isoformat()
         
         # === Generate Final Report ===
         logger.info(f"Generating comprehensive report...")
-        dialogue_transcript = self._build_dialogue_transcript(session.turns)
+        dialogue_transcript = self._build_dialogue_transcript(session["turns"])
         
-        report = self.report_generator.generate_report(
+        report = await asyncio.to_thread(
+            self.report_generator.generate_report,
             session_id=session_id,
-            final_outcome=session.final_outcome or "max_rounds_reached",
+            final_outcome=session["final_outcome"] or "max_rounds_reached",
             round_evaluations=round_evaluations,
             dialogue_transcript=dialogue_transcript
         )
@@ -396,6 +509,39 @@ class MedicalJudge(GreenAgent):
         logger.info(f"Session complete: {report.final_outcome}, aggregate score: {report.aggregate_score:.2f}")
         
         return session, report
+    
+    def _create_patient(
+        self,
+        character_description: str,
+        roleplay_examples: PatientRoleplayExamples
+    ) -> Callable[[str], Awaitable[str]]:
+        """
+        Create a session's patient agent and return its respond coroutine function
+        
+        Uses AsyncPatientAgent when an AsyncOpenAI patient client is configured;
+        otherwise the sync PatientAgent runs in a worker thread so it doesn't block
+        the event loop.
+        """
+        options: dict[str, Any] = {
+            "max_retries": self.patient_max_retries,
+            "retry_delay": self.patient_retry_delay,
+            "use_roleplay_context": True,
+            "roleplay_examples": roleplay_examples,
+            "history_compaction_threshold": self.patient_history_compaction_threshold,
+            "summary_model": self.patient_summary_model,
+            "stream_usage": self.patient_stream_usage,
+        }
+        if self._patient_async_client is not None:
+            return AsyncPatientAgent(
+                self._patient_async_client, self._patient_model, character_description, **options
+            ).respond
+        
+        patient = PatientAgent(self._patient_client, self._patient_model, character_description, **options)
+        
+        async def respond(doctor_message: str) -> str:
+            return await asyncio.to_thread(patient.respond, doctor_message)
+        
+        return respond
 
     @staticmethod
     def _build_doctor_context(
@@ -430,7 +576,7 @@ Prognosis without Treatment: {clinical_info.prognosis_without_treatment}
         if turns:
             context += "\n=== Dialogue History ===\n"
             for turn in turns:
-                context += f"{turn.speaker.upper()}: {turn.message}\n\n"
+                context += f"{turn['speaker'].upper()}: {turn['message']}\n\n"
             context += "Now provide your next response to the patient."
         else:
             context += """\nNote: The patient will describe their symptoms and concerns during the consultation.
@@ -451,7 +597,7 @@ Provide your opening message to the patient."""
         """Build readable dialogue transcript"""
         transcript = ""
         for turn in turns:
-            transcript += f"{turn.speaker.upper()}: {turn.message}\n\n"
+            transcript += f"{turn['speaker'].upper()}: {turn['message']}\n\n"
         return transcript
 
     def _determine_winner(self, sessions: list[DialogueSession], mean_score: float) -> str:
@@ -470,7 +616,7 @@ Provide your opening message to the patient."""
         Returns:
             Winner identifier: "doctor" or "patient"
         """
-        outcomes = [session.final_outcome for session in sessions]
+        outcomes = [session["final_outcome"] for session in sessions]
         
         # Check if any patient left
         if "patient_left" in outcomes:
@@ -497,7 +643,7 @@ Provide your opening message to the patient."""
         # Outcome breakdown
         outcomes = {}
         for session in sessions:
-            outcome = session.final_outcome or "unknown"
+            outcome = session["final_outcome"] or "unknown"
             outcomes[outcome] = outcomes.get(outcome, 0) + 1
         
         summary += "Outcomes:\n"
@@ -545,7 +691,22 @@ async def main():
     }
     if judge_azure_api_version:
         judge_client_kwargs["default_headers"] = {"api-version": judge_azure_api_version}
-    judge_client = OpenAI(**judge_client_kwargs)
+    judge_client = OpenAI(
+        **judge_client_kwargs,
+        http_client=DefaultHttpxClient(**HTTP_CLIENT_KWARGS)
+    )
+    
+    # Async judge client used by the per-round scoring engine
+    judge_async_client = AsyncOpenAI(
+        **judge_client_kwargs,
+        http_client=DefaultAsyncHttpxClient(**HTTP_CLIENT_KWARGS)
+    )
+    
+    # Async patient client used by AsyncPatientAgent (same settings as the sync patient client)
+    patient_async_client = AsyncOpenAI(
+        **judge_client_kwargs,
+        http_client=DefaultAsyncHttpxClient(**HTTP_CLIENT_KWARGS)
+    )
     
     # Create patient client (only if different from judge)
     patient_client = None
@@ -558,7 +719,14 @@ async def main():
         }
         if patient_azure_api_version:
             patient_client_kwargs["default_headers"] = {"api-version": patient_azure_api_version}
-        patient_client = OpenAI(**patient_client_kwargs)
+        patient_client = OpenAI(
+            **patient_client_kwargs,
+            http_client=DefaultHttpxClient(**HTTP_CLIENT_KWARGS)
+        )
+        patient_async_client = AsyncOpenAI(
+            **patient_client_kwargs,
+            http_client=DefaultAsyncHttpxClient(**HTTP_CLIENT_KWARGS)
+        )
         
     if args.cloudflare_quick_tunnel:
         from agentbeats.cloudflare import quick_tunnel
@@ -567,7 +735,12 @@ async def main():
         agent_url_cm = contextlib.nullcontext(args.card_url or f"http://{args.host}:{args.port}/")
     
     async with agent_url_cm as agent_url:
-        agent = MedicalJudge(judge_client, judge_model, patient_client, patient_model)
+        agent = MedicalJudge(
+            judge_client, judge_model, judge_async_client,
+            patient_client=patient_client,
+            patient_model=patient_model,
+            patient_async_client=patient_async_client
+        )
         executor = GreenExecutor(agent)
         agent_card = medical_judge_agent_card("MedicalDialogueJudge", agent_url)
         
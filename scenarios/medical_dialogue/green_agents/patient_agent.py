@@ -2,24 +2,122 @@
 Patient Agent - Simulates patient with personality-driven behavior
 """
 
+import asyncio
+import functools
+import itertools
 import logging
 import random
 import time
 from pathlib import Path
-from typing import List, Optional
+from typing import Generic, List, Optional, Sequence, TypeVar
 
-from openai import OpenAI
+from openai import APIStatusError, AsyncOpenAI, BadRequestError, OpenAI
 from openai.types.chat import ChatCompletionSystemMessageParam, ChatCompletionUserMessageParam, \
     ChatCompletionAssistantMessageParam
+from openai.types.completion_usage import CompletionUsage
 
 from roleplay_context_loader import RolePlayContextLoader
 from common import PatientRoleplayExamples
 
 logger = logging.getLogger(__name__)
 
+ClientT = TypeVar("ClientT", OpenAI, AsyncOpenAI)
+
 # Retry configuration
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # seconds
+MAX_RETRY_DELAY = 30  # seconds, cap for the exponential backoff window and for server Retry-After
+
+# History compaction (disabled unless a threshold is configured)
+HISTORY_KEEP_RECENT = 4  # most recent messages always kept verbatim
+
+HISTORY_SUMMARY_PROMPT = (
+    "You are the patient in the conversation above. Write a concise first-person memory of it "
+    "(under 150 words) in your own voice: what the doctor explained or proposed, what you said, "
+    "your feelings and concerns, and where you currently stand on the recommended treatment. "
+    "Output only the memory."
+)
+
+
+def _split_response(response: str) -> tuple[str, str]:
+    """
+    Split a roleplay response into (full response, part visible to the doctor) in one pass
+    
+    Each hidden "Think:" section runs up to the next "Do:" marker or the end of the response.
+    """
+    think_idx = response.find("Think:")
+    if think_idx == -1:
+        return response, response.strip()
+    
+    visible_parts = []
+    start = 0
+    while think_idx != -1:
+        visible_parts.append(response[start:think_idx])
+        do_idx = response.find("Do:", think_idx + len("Think:"))
+        if do_idx == -1:
+            start = len(response)
+            break
+        start = do_idx
+        think_idx = response.find("Think:", do_idx)
+    visible_parts.append(response[start:])
+    return response, "".join(visible_parts).strip()
+
+
+class _StreamedResponse:
+    """
+    Accumulate a streamed completion, filtering out Think: sections as chunks arrive
+    
+    Markers may be split across chunks, so a short tail that could be the start of
+    the next marker is held back until more text arrives. Produces the same visible
+    text as _split_response.
+    """
+    
+    def __init__(self):
+        self._full_parts: list[str] = []
+        self._visible_parts: list[str] = []
+        self._pending = ""
+        self._in_think = False
+    
+    def add_chunk(self, chunk) -> None:
+        """Consume one ChatCompletionChunk"""
+        if chunk.usage is not None:
+            # Final chunk when stream_options include_usage is set
+            _BasePatientAgent._log_prompt_cache_usage(chunk.usage)
+        if not chunk.choices:
+            return
+        delta = chunk.choices[0].delta.content
+        if delta:
+            self._full_parts.append(delta)
+            self._feed(delta)
+    
+    def _feed(self, text: str) -> None:
+        buf = self._pending + text
+        while True:
+            if self._in_think:
+                do_idx = buf.find("Do:")
+                if do_idx == -1:
+                    # Hidden text is dropped; keep a tail that may start "Do:"
+                    self._pending = buf[-(len("Do:") - 1):]
+                    return
+                self._in_think = False
+                buf = buf[do_idx:]
+            else:
+                think_idx = buf.find("Think:")
+                if think_idx == -1:
+                    keep = len("Think:") - 1
+                    self._visible_parts.append(buf[:-keep])
+                    self._pending = buf[-keep:]
+                    return
+                self._visible_parts.append(buf[:think_idx])
+                self._in_think = True
+                buf = buf[think_idx + len("Think:"):]
+    
+    def result(self) -> tuple[str, str]:
+        """Return (full response, part visible to the doctor)"""
+        if not self._in_think:
+            self._visible_parts.append(self._pending)
+        self._pending = ""
+        return "".join(self._full_parts), "".join(self._visible_parts).strip()
 
 
 def extract_spoken_dialogue(response: str) -> str:
@@ -35,21 +133,36 @@ def extract_spoken_dialogue(response: str) -> str:
     Returns:
         Spoken dialogue and visible actions (what the doctor can see/hear)
     """
-    # Check if response follows the Say/Think/Do format
-    if "Think:" in response:
-        # Remove the Think: section (internal thoughts hidden from doctor)
-        parts = response.split("Think:")
-        before_think = parts[0]  # Say: and possibly Do: before Think:
-        
-        # Check if there's a Do: section after Think:
-        if len(parts) > 1 and "Do:" in parts[1]:
-            after_think = "Do:" + parts[1].split("Do:")[1]
-            return (before_think + after_think).strip()
-        
-        return before_think.strip()
+    return _split_response(response)[1]
+
+
+@functools.lru_cache(maxsize=4)
+def _get_loader(context_dir: str) -> RolePlayContextLoader:
+    """Return a shared RolePlayContextLoader per context directory"""
+    return RolePlayContextLoader(context_dir)
+
+
+def _roleplay_prefix(
+    context_dir: str,
+    roleplay_examples: PatientRoleplayExamples
+) -> tuple[str, tuple[ChatCompletionUserMessageParam | ChatCompletionAssistantMessageParam, ...]]:
+    """
+    Format the role-play context for a persona's roleplay examples
     
-    # If no Think: section, return the whole response (Say: and Do: are both visible)
-    return response.strip()
+    Not cached here: the shared loader keeps the compiled template and reloads it
+    when role_play.csv changes on disk, so edits reach new patient agents.
+    """
+    system_prompt, context_messages = _get_loader(context_dir).format_roleplay_context(
+        role_core_description=roleplay_examples.role_core_description,
+        role_acknowledgement_phrase=roleplay_examples.role_acknowledgement_phrase,
+        role_rules_and_constraints=roleplay_examples.role_rules_and_constraints,
+        role_confirmation_phrase=roleplay_examples.role_confirmation_phrase,
+        example_say=roleplay_examples.example_say,
+        example_think=roleplay_examples.example_think,
+        example_do=roleplay_examples.example_do
+    )
+    return system_prompt, tuple(context_messages)
+
 
 # Diverse fallback messages when API fails - natural patient responses
 FALLBACK_MESSAGES = [
@@ -62,32 +175,36 @@ FALLBACK_MESSAGES = [
     "I don't know... I'm really confused about all this.",
     "Everything you're saying is just... it's overwhelming.",
 ]
+# Fallbacks rotate deterministically across calls
+_FALLBACK_ITER = itertools.cycle(FALLBACK_MESSAGES)
 
 
-class PatientAgent:
+class _BasePatientAgent(Generic[ClientT]):
     """
-    Simulates patient with personality-driven behavior
+    Patient state and turn handling shared by the sync and async patient agents
     
-    Uses full system prompt (MBTI personality + background + concerns)
-    that is HIDDEN from Doctor Agent
+    Subclasses add respond() and history compaction for their client type.
     """
     
     def __init__(
         self, 
-        client: OpenAI, 
+        client: ClientT, 
         model: str, 
         character_description: str, 
         max_retries: int = MAX_RETRIES, 
         retry_delay: int = RETRY_DELAY,
         use_roleplay_context: bool = True,
         roleplay_examples: Optional[PatientRoleplayExamples] = None,
-        context_dir: Optional[Path | str] = None
+        context_dir: Optional[Path | str] = None,
+        history_compaction_threshold: int = 0,
+        summary_model: Optional[str] = None,
+        stream_usage: bool = False
     ):
         """
         Initialize PatientAgent
         
         Args:
-            client: OpenAI client for LLM calls
+            client: OpenAI or AsyncOpenAI client for LLM calls
             model: Model name to use
             character_description: Full patient character description (includes personality)
             max_retries: Maximum number of retry attempts
@@ -95,20 +212,36 @@ class PatientAgent:
             use_roleplay_context: Whether to use roleplay context engineering
             roleplay_examples: Generated roleplay examples from PatientConstructor
             context_dir: Path to agent_context directory (auto-detected if None)
+            history_compaction_threshold: Summarize older turns once the history exceeds
+                this many messages (0 disables compaction)
+            summary_model: Model used for history summaries (defaults to model)
+            stream_usage: Request token usage on streamed responses (stream_options
+                include_usage) to log prompt cache hits; not every OpenAI-compatible
+                backend accepts it
         """
-        self.client = client
+        self.client: ClientT = client
         self.model = model
         self.character_description = character_description
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self.dialogue_history: list[dict] = []  # List of {role: str, content: str}
+        # Dialogue turns stored directly as chat message params (appended in place)
+        self.dialogue_history: List[
+            ChatCompletionUserMessageParam | ChatCompletionAssistantMessageParam
+        ] = []
+        
+        # Rolling summary of turns compacted out of dialogue_history
+        self.history_compaction_threshold = history_compaction_threshold
+        self.summary_model = summary_model or model
+        self.history_summary: str | None = None
+        
+        self.stream_usage = stream_usage
         
         # Role-play context engineering
         self.use_roleplay_context = use_roleplay_context
         self.roleplay_system_prompt: str | None = None  # Simple system prompt for roleplay
-        self.roleplay_context_messages: List[
-            ChatCompletionUserMessageParam | ChatCompletionAssistantMessageParam
-        ] = []
+        self.roleplay_context_messages: tuple[
+            ChatCompletionUserMessageParam | ChatCompletionAssistantMessageParam, ...
+        ] = ()
         
         if self.use_roleplay_context and roleplay_examples:
             # Auto-detect context_dir if not provided
@@ -116,40 +249,146 @@ class PatientAgent:
                 # Assume we're in green_agents/ and need to go up to medical_dialogue/agent_context
                 context_dir = Path(__file__).parent.parent / "agent_context"
             
-            context_loader = RolePlayContextLoader(context_dir)
-            self.roleplay_system_prompt, self.roleplay_context_messages = context_loader.format_roleplay_context(
-                role_core_description=roleplay_examples.role_core_description,
-                role_acknowledgement_phrase=roleplay_examples.role_acknowledgement_phrase,
-                role_rules_and_constraints=roleplay_examples.role_rules_and_constraints,
-                role_confirmation_phrase=roleplay_examples.role_confirmation_phrase,
-                example_say=roleplay_examples.example_say,
-                example_think=roleplay_examples.example_think,
-                example_do=roleplay_examples.example_do
+            self.roleplay_system_prompt, self.roleplay_context_messages = _roleplay_prefix(
+                str(context_dir), roleplay_examples
             )
             logger.info(f"PatientAgent initialized with {len(self.roleplay_context_messages)} role-play context messages and simple system prompt")
         else:
             logger.info(f"PatientAgent initialized without role-play context")
         
+        # Static prompt prefix, built once so every turn sends a byte-identical
+        # prefix and provider-side prompt caching can reuse it
+        self._prefix_messages: tuple[
+            ChatCompletionSystemMessageParam |
+            ChatCompletionUserMessageParam |
+            ChatCompletionAssistantMessageParam, ...
+        ] = self._build_prefix_messages()
+        
         logger.info(f"PatientAgent initialized with personality-driven system prompt (retries={max_retries}, delay={retry_delay}s)")
     
+    def _build_prefix_messages(self) -> tuple[
+        ChatCompletionSystemMessageParam |
+        ChatCompletionUserMessageParam |
+        ChatCompletionAssistantMessageParam, ...
+    ]:
+        """Build the static system + role-play context messages sent before the dialogue"""
+        # Use simple system prompt if roleplay context is enabled, otherwise use full character description
+        if self.use_roleplay_context and self.roleplay_system_prompt:
+            return (
+                {"role": "system", "content": self.roleplay_system_prompt},
+                # Role-play context priming messages (contains detailed character description)
+                *self.roleplay_context_messages,
+            )
+        # Use full detailed character description as system prompt (backward compatibility)
+        return ({"role": "system", "content": self.character_description},)
+    
     def reset(self):
         """Reset dialogue history for new conversation"""
         self.dialogue_history = []
+        self.history_summary = None
         logger.info("PatientAgent dialogue history reset")
     
-    def respond(self, doctor_message: str) -> str:
+    def _compaction_messages(self) -> List[
+        ChatCompletionSystemMessageParam |
+        ChatCompletionUserMessageParam |
+        ChatCompletionAssistantMessageParam
+    ] | None:
+        """Return the summarization request if the history needs compacting, else None"""
+        if not self.history_compaction_threshold:
+            return None
+        if len(self.dialogue_history) <= max(self.history_compaction_threshold, HISTORY_KEEP_RECENT):
+            return None
+        return [
+            *self._prefix_messages,
+            *self._summary_messages(),
+            *self.dialogue_history[:-HISTORY_KEEP_RECENT],
+            {"role": "user", "content": HISTORY_SUMMARY_PROMPT},
+        ]
+    
+    def _apply_compaction(self, summary: str | None) -> None:
+        """Replace the compacted turns with the new summary"""
+        if not summary or not summary.strip():
+            logger.warning("History compaction returned an empty summary; keeping full history")
+            return
+        compacted = len(self.dialogue_history) - HISTORY_KEEP_RECENT
+        self.history_summary = summary.strip()
+        del self.dialogue_history[:compacted]
+        logger.info(f"Compacted {compacted} dialogue messages into rolling summary")
+    
+    def _summary_messages(self) -> tuple[ChatCompletionAssistantMessageParam, ...]:
+        """Rolling summary as a patient "inner memory" message (empty before first compaction)"""
+        if self.history_summary is None:
+            return ()
+        return ({
+            "role": "assistant",
+            "content": f"(My memory of our conversation so far) {self.history_summary}"
+        },)
+    
+    def _response_request(self, messages: list) -> dict:
+        """Keyword arguments for the streamed patient-response completion"""
+        request = {"model": self.model, "messages": messages, "stream": True}
+        if self.stream_usage:
+            request["stream_options"] = {"include_usage": True}
+        return request
+    
+    def _check_attempt(
+        self,
+        attempt: int,
+        patient_response: str | None,
+        error: Exception | None
+    ) -> tuple[str | None, float | None]:
         """
-        Generate patient response to doctor's message
+        Classify the outcome of one response attempt
         
-        Uses LLM with personality traits to generate response.
+        Returns:
+            (last error message or None, seconds to wait before retrying or None to stop)
+        """
+        if error is None and patient_response is not None and len(patient_response.strip()) > 0:
+            logger.debug("Patient generated response (%d chars)", len(patient_response))
+            return None, None
         
-        Args:
-            doctor_message: Doctor's latest message
+        if isinstance(error, BadRequestError):
+            # Not retryable - the same request would be rejected again
+            logger.warning(f"Attempt {attempt + 1} failed with non-retryable error: {error}")
+            return str(error), None
+        if error is not None:
+            logger.warning(f"Attempt {attempt + 1} failed: {error}")
+            last_error = str(error)
+        else:
+            logger.warning(f"Attempt {attempt + 1}: API returned empty or None content")
+            last_error = "Empty or None response from API"
         
-        Returns:
-            Patient's response message
+        if attempt >= self.max_retries - 1:
+            return last_error, None
+        # Wait before retry (jittered exponential backoff or server Retry-After)
+        delay = self._retry_delay_for(attempt, error)
+        logger.info(f"Retrying in {delay:.1f} seconds...")
+        return last_error, delay
+    
+    def _retry_delay_for(self, attempt: int, error: Exception | None) -> float:
         """
-        logger.info(f"Patient generating response to doctor message")
+        Compute the wait before the next attempt
+        
+        Honors the server's Retry-After header when present (capped at MAX_RETRY_DELAY,
+        so a long value can't stall the session), otherwise uses full jitter so
+        concurrent sessions don't retry a rate-limited endpoint in lockstep.
+        """
+        if isinstance(error, APIStatusError):
+            retry_after = error.response.headers.get("retry-after")
+            if retry_after is not None:
+                try:
+                    return min(max(0.0, float(retry_after)), MAX_RETRY_DELAY)
+                except ValueError:
+                    pass  # HTTP-date form, fall back to backoff
+        return random.uniform(0, min(self.retry_delay * (2 ** attempt), MAX_RETRY_DELAY))
+    
+    def _start_turn(self, doctor_message: str) -> List[
+        ChatCompletionSystemMessageParam |
+        ChatCompletionUserMessageParam |
+        ChatCompletionAssistantMessageParam
+    ]:
+        """Record the doctor's message and return the messages to send to the LLM"""
+        logger.debug("Patient generating response to doctor message")
         
         # Add doctor's message to history
         self.dialogue_history.append({
@@ -157,99 +396,208 @@ class PatientAgent:
             "content": doctor_message
         })
         
-        # Build conversation messages for LLM
-        messages: List[
-            ChatCompletionSystemMessageParam |
-            ChatCompletionUserMessageParam |
-            ChatCompletionAssistantMessageParam
-        ] = []
-        
-        # Use simple system prompt if roleplay context is enabled, otherwise use full character description
-        if self.use_roleplay_context and self.roleplay_system_prompt:
-            messages.append(ChatCompletionSystemMessageParam(content=self.roleplay_system_prompt, role="system"))
-            # Add role-play context priming messages (contains detailed character description)
-            messages.extend(self.roleplay_context_messages)
-        else:
-            # Use full detailed character description as system prompt (backward compatibility)
-            messages.append(ChatCompletionSystemMessageParam(content=self.character_description, role="system"))
-        
-        # Add dialogue history
-        for turn in self.dialogue_history:
-            if turn["role"] == "user":
-                messages.append(ChatCompletionUserMessageParam(
-                    content=turn["content"],
-                    role="user"
-                ))
-            elif turn["role"] == "assistant":
-                messages.append(ChatCompletionAssistantMessageParam(
-                    content=turn["content"],
-                    role="assistant"
-                ))
-        
-        # Generate patient response with retry logic
-        patient_response = None
-        last_error = None
-        
-        for attempt in range(self.max_retries):
-            try:
-                logger.info(f"Generating patient response (attempt {attempt + 1}/{self.max_retries})")
-                
-                completion = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                )
-                
-                patient_response = completion.choices[0].message.content
-                
-                # Check if response is valid
-                if patient_response is not None and len(patient_response.strip()) > 0:
-                    logger.info(f"Patient generated response ({len(patient_response)} chars)")
-                    break
-                else:
-                    logger.warning(f"Attempt {attempt + 1}: API returned empty or None content")
-                    last_error = "Empty or None response from API"
-                    
-            except Exception as e:
-                logger.warning(f"Attempt {attempt + 1} failed: {e}")
-                last_error = str(e)
-                
-            # Wait before retry (exponential backoff)
-            if attempt < self.max_retries - 1:
-                delay = self.retry_delay * (2 ** attempt)
-                logger.info(f"Retrying in {delay} seconds...")
-                time.sleep(delay)
-        
+        # Conversation messages for LLM: cached static prefix + rolling summary + dialogue history
+        return [*self._prefix_messages, *self._summary_messages(), *self.dialogue_history]
+    
+    def _finish_turn(
+        self,
+        patient_response: str | None,
+        last_error: str | None,
+        spoken_dialogue: str | None = None
+    ) -> str:
+        """Record the patient's full response and return the part visible to the doctor"""
         # Handle final failure
         if patient_response is None or len(patient_response.strip()) == 0:
             error_msg = f"Failed to generate patient response after {self.max_retries} attempts. Last error: {last_error}"
             logger.error(error_msg)
-            # Use a random fallback message to maintain natural conversation flow
-            patient_response = random.choice(FALLBACK_MESSAGES)
+            # Use the next fallback message to maintain natural conversation flow
+            patient_response = next(_FALLBACK_ITER)
+            spoken_dialogue = None
             logger.info(f"Using fallback message: {patient_response[:50]}...")
         
         # Log full response (including Think/Do if present) for debugging
-        logger.debug(f"Full patient response: {patient_response[:200]}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Full patient response: %s...", patient_response[:200])
+        
+        # Visible parts (Say: + Do:, but NOT Think:) are already known for streamed responses
+        if spoken_dialogue is None:
+            full_response, spoken_dialogue = _split_response(patient_response)
+        else:
+            full_response = patient_response
         
         # IMPORTANT: Add patient's FULL response to history (including Think:)
         # This maintains complete internal context for the patient agent in future rounds
         # The patient can reference their own thoughts across the conversation
         self.dialogue_history.append({
             "role": "assistant",
-            "content": patient_response  # Full response with Say:, Think:, and Do:
+            "content": full_response  # Full response with Say:, Think:, and Do:
         })
         
-        # Extract visible parts only (Say: + Do:, but NOT Think:)
-        # This is what gets sent to the doctor - they cannot see internal thoughts
-        spoken_dialogue = extract_spoken_dialogue(patient_response)
-        logger.info(f"Visible response to doctor: {spoken_dialogue[:100]}...")
+        # Only the visible parts are sent to the doctor - they cannot see internal thoughts
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Visible response to doctor: %s...", spoken_dialogue[:100])
         
         return spoken_dialogue  # Doctor only receives this (no Think: part)
     
-    def get_dialogue_history(self) -> list[dict]:
+    @staticmethod
+    def _log_prompt_cache_usage(usage: CompletionUsage) -> None:
+        """Log how many prompt tokens were served from the provider's prefix cache (if reported)"""
+        details = usage.prompt_tokens_details
+        cached_tokens = details.cached_tokens if details is not None else None
+        if cached_tokens is not None:
+            logger.debug("Prompt cache hit: %s/%s prompt tokens", cached_tokens, usage.prompt_tokens)
+    
+    def get_dialogue_history(self) -> Sequence[ChatCompletionUserMessageParam | ChatCompletionAssistantMessageParam]:
         """
         Get full dialogue history
         
+        Returns the live history without copying; callers must treat it as read-only
+        (use list(...) for a snapshot that outlives the next turn).
+        
+        Returns:
+            Dialogue turns with role and content (turns folded into
+            history_summary by compaction are not included)
+        """
+        return self.dialogue_history
+    
+    def get_last_n_turns(self, n: int) -> List[ChatCompletionUserMessageParam | ChatCompletionAssistantMessageParam]:
+        """
+        Get a copy of the most recent n dialogue messages
+        
+        Args:
+            n: Number of messages to return (a round is a doctor + patient pair)
+        
+        Returns:
+            Up to n most recent dialogue messages, oldest first
+        """
+        if n <= 0:
+            return []
+        return self.dialogue_history[-n:]
+
+
+class PatientAgent(_BasePatientAgent[OpenAI]):
+    """
+    Simulates patient with personality-driven behavior
+    
+    Uses full system prompt (MBTI personality + background + concerns)
+    that is HIDDEN from Doctor Agent
+    """
+    
+    def respond(self, doctor_message: str) -> str:
+        """
+        Generate patient response to doctor's message
+        
+        Uses LLM with personality traits to generate response.
+        
+        Args:
+            doctor_message: Doctor's latest message
+        
+        Returns:
+            Patient's response message
+        """
+        self._maybe_compact_history()
+        messages = self._start_turn(doctor_message)
+        
+        # Generate patient response with retry logic
+        patient_response = None
+        spoken_dialogue = None
+        last_error = None
+        
+        for attempt in range(self.max_retries):
+            error = None
+            try:
+                logger.debug("Generating patient response (attempt %d/%d)", attempt + 1, self.max_retries)
+                stream = self.client.chat.completions.create(**self._response_request(messages))
+                
+                # Think: sections are filtered out while tokens are still arriving
+                streamed = _StreamedResponse()
+                for chunk in stream:
+                    streamed.add_chunk(chunk)
+                patient_response, spoken_dialogue = streamed.result()
+            except Exception as e:
+                error = e
+            
+            last_error, delay = self._check_attempt(attempt, patient_response, error)
+            if delay is None:
+                break
+            time.sleep(delay)
+        
+        return self._finish_turn(patient_response, last_error, spoken_dialogue)
+    
+    def _maybe_compact_history(self) -> None:
+        """Fold older turns into the rolling summary once the history exceeds the threshold"""
+        summary_messages = self._compaction_messages()
+        if summary_messages is None:
+            return
+        try:
+            completion = self.client.chat.completions.create(
+                model=self.summary_model,
+                messages=summary_messages,
+            )
+            self._apply_compaction(completion.choices[0].message.content)
+        except Exception as e:
+            # Keep the full history; compaction is retried on the next turn
+            logger.warning(f"History compaction failed: {e}")
+
+
+class AsyncPatientAgent(_BasePatientAgent[AsyncOpenAI]):
+    """
+    PatientAgent backed by an AsyncOpenAI client
+    
+    Does not block the event loop while waiting on the LLM, so the judge can
+    run several dialogue sessions concurrently.
+    """
+    
+    async def respond(self, doctor_message: str) -> str:
+        """
+        Generate patient response to doctor's message
+        
+        Args:
+            doctor_message: Doctor's latest message
+        
         Returns:
-            List of dialogue turns with role and content
+            Patient's response message
         """
-        return self.dialogue_history.copy()
+        await self._maybe_compact_history()
+        messages = self._start_turn(doctor_message)
+        
+        # Generate patient response with retry logic
+        patient_response = None
+        spoken_dialogue = None
+        last_error = None
+        
+        for attempt in range(self.max_retries):
+            error = None
+            try:
+                logger.debug("Generating patient response (attempt %d/%d)", attempt + 1, self.max_retries)
+                stream = await self.client.chat.completions.create(**self._response_request(messages))
+                
+                # Think: sections are filtered out while tokens are still arriving
+                streamed = _StreamedResponse()
+                async for chunk in stream:
+                    streamed.add_chunk(chunk)
+                patient_response, spoken_dialogue = streamed.result()
+            except Exception as e:
+                error = e
+            
+            last_error, delay = self._check_attempt(attempt, patient_response, error)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+        
+        return self._finish_turn(patient_response, last_error, spoken_dialogue)
+    
+    async def _maybe_compact_history(self) -> None:
+        """Fold older turns into the rolling summary once the history exceeds the threshold"""
+        summary_messages = self._compaction_messages()
+        if summary_messages is None:
+            return
+        try:
+            completion = await self.client.chat.completions.create(
+                model=self.summary_model,
+                messages=summary_messages,
+            )
+            self._apply_compaction(completion.choices[0].message.content)
+        except Exception as e:
+            # Keep the full history; compaction is retried on the next turn
+            logger.warning(f"History compaction failed: {e}")
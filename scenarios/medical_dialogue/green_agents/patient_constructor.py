@@ -7,16 +7,200 @@ Flow:
 3. Extract PatientClinicalInfo from PatientBackground (subset for doctor - no extraction needed!)
 """
 
+import asyncio
+import hashlib
+import json
 import logging
-from openai import OpenAI
-from openai.types.chat import ChatCompletionSystemMessageParam, ChatCompletionUserMessageParam
+import os
+from pathlib import Path
+from openai import AsyncOpenAI
 from pydantic import BaseModel
 
-from persona_manager import PersonaManager
+from persona_manager import PersonaManager, get_default_manager
 from common import PatientPersona, PatientBackground, PatientClinicalInfo, PatientRoleplayExamples
 
 logger = logging.getLogger(__name__)
 
+# Bump when the generation prompts in this module change, to invalidate cached personas
+PERSONA_CACHE_VERSION = 1
+
+MAX_CONCURRENCY = 4  # personas constructed at once by construct_patient_personas
+
+
+# ==================== Prompt Templates ====================
+# Static across personas; user templates are filled with str.format_map per call
+
+_BACKGROUND_SYSTEM_MSG = """You are generating a complete patient background for a medical dialogue simulation.
+
+Generate a realistic, detailed patient profile that includes:
+1. Demographics (age 35-65, gender, occupation aligned with MBTI)
+2. Complete medical information (symptoms, diagnosis, treatment details, prognosis)
+3. Personal background (family, lifestyle, values, concerns)
+
+The patient background must be:
+- Medically accurate and realistic
+- Consistent with the MBTI personality type
+- Cohesive and believable as a real person
+
+Return a structured JSON object with ALL required fields filled in with realistic, detailed content."""
+
+_BACKGROUND_USER_TEMPLATE = """Generate a complete patient background by combining these elements:
+
+=== MBTI Personality Type: {mbti_type} ===
+{mbti_prompt}
+
+=== Gender ===
+{gender_instruction}
+
+=== Medical Case: {medical_case} ===
+{case_prompt}
+
+Generate a complete PatientBackground with:
+- age: int (35-65, realistic for condition)
+- gender: str ("male" or "female")
+- occupation: str (job aligned with personality)
+- medical_case: str ("{medical_case}")
+- symptoms: str (current symptoms patient experiences)
+- diagnosis: str (medical diagnosis)
+- recommended_treatment: str (surgical procedure recommended)
+- treatment_risks: str (risks of the treatment)
+- treatment_benefits: str (benefits of treatment)
+- prognosis_with_treatment: str (expected outcome if treated)
+- prognosis_without_treatment: str (expected outcome if not treated)
+- family_situation: str (family context)
+- lifestyle: str (daily life, habits)
+- values: str (what matters to this person)
+- concerns_and_fears: str (personality-driven concerns about the medical situation)"""
+
+_CHARACTER_SYSTEM_MSG = """You are creating a patient character description from structured background information.
+
+Your task: Transform the patient background data into a compelling, second-person narrative that will instruct an AI to roleplay this patient.
+
+Write in SECOND PERSON ("You are...") as direct instructions to roleplay this character.
+The character description should:
+- Establish the character's identity, background, and current situation
+- Describe their personality and communication style based on MBTI
+- Detail their medical situation and concerns
+- Explain how they respond to doctors and medical discussions
+
+IMPORTANT: The patient should speak naturally like a real person - no bullet points, no numbered lists, no markdown formatting. Just natural conversational speech with appropriate length (not too long, not too short).
+
+Output 300-500 words of cohesive narrative."""
+
+_CHARACTER_USER_TEMPLATE = """Transform this patient background into a character description:
+
+=== MBTI Type: {mbti_type} ===
+{mbti_prompt}
+
+=== Patient Background ===
+Age: {age}
+Gender: {gender}
+Occupation: {occupation}
+
+Medical Situation:
+- Case: {medical_case}
+- Symptoms: {symptoms}
+- Diagnosis: {diagnosis}
+- Recommended Treatment: {recommended_treatment}
+- Treatment Risks: {treatment_risks}
+- Treatment Benefits: {treatment_benefits}
+- Prognosis with Treatment: {prognosis_with_treatment}
+- Prognosis without Treatment: {prognosis_without_treatment}
+
+Personal Background:
+- Family: {family_situation}
+- Lifestyle: {lifestyle}
+- Values: {values}
+- Concerns and Fears: {concerns_and_fears}
+
+Write a cohesive patient persona in second person ("You are...") that brings this character to life."""
+
+# Deterministic character description, used instead of the LLM rewrite unless use_llm_rendering is set
+_CHARACTER_DESCRIPTION_TEMPLATE = """You are a {age}-year-old {gender} patient. Your occupation: {occupation}.
+
+Your personality ({mbti_type}):
+{mbti_prompt}
+
+Your medical situation:
+- What you are experiencing: {symptoms}
+- Your diagnosis: {diagnosis}
+- The treatment your doctor recommends: {recommended_treatment}
+- Risks of the treatment: {treatment_risks}
+- Benefits of the treatment: {treatment_benefits}
+- Outlook with treatment: {prognosis_with_treatment}
+- Outlook without treatment: {prognosis_without_treatment}
+
+Your life:
+- Family: {family_situation}
+- Lifestyle: {lifestyle}
+- What matters to you: {values}
+- Your concerns and fears: {concerns_and_fears}
+
+When you talk with the doctor, speak naturally like a real person - no bullet points, no numbered lists, no markdown formatting. Let your personality, values, and fears shape how you react to what the doctor says."""
+
+_ROLEPLAY_SYSTEM_MSG = """You are generating roleplay examples for a patient character in a medical dialogue simulation.
+
+Given the patient's background, generate realistic examples of how they would:
+1. Say something (dialogue) - KEEP IT SHORT and natural, like real patient speech
+2. Think something (inner thoughts that may differ from what they say)
+3. Do something (physical action or body language)
+
+CRITICAL REALISM REQUIREMENTS:
+- Real patients speak briefly (1-2 sentences typically, not long explanations)
+- Real patients have LIMITED medical knowledge (use simple/incorrect terms, ask questions)
+- Real patient speech is NOT grammatically perfect (sentence fragments, hesitations, informal language)
+- Real patients express emotions naturally (worry, confusion, fear)
+
+Return a structured JSON object with the required example fields."""
+
+_ROLEPLAY_USER_TEMPLATE = """Generate roleplay examples for this patient character:
+
+=== Patient Background ===
+Age: {age}
+Gender: {gender}
+Occupation: {occupation}
+MBTI Type: {mbti_type}
+
+Medical Situation:
+- Case: {medical_case}
+- Symptoms: {symptoms}
+- Diagnosis: {diagnosis}
+- Concerns: {concerns_and_fears}
+
+Personal Context:
+- Values: {values}
+- Family: {family_situation}
+- Lifestyle: {lifestyle}
+
+=== Required Output ===
+
+Generate these fields:
+
+1. example_say: A realistic SHORT line of dialogue this patient might say to the doctor (1-2 sentences max, natural speech with possible hesitations or imperfect grammar, emotionally authentic)
+2. example_think: What this patient might be thinking internally (may differ from what they say)
+3. example_do: A physical action or body language this patient might display (based on personality and emotional state)
+
+Make the examples specific to THIS patient's personality, situation, and concerns.
+
+CRITICAL: The example_say should be BRIEF and sound like real patient speech - not polished, not verbose, possibly with hesitations like "um", "I mean", sentence fragments, or informal language."""
+
+# Fixed roleplay messages that don't change across patients
+_ROLE_ACKNOWLEDGEMENT = "Understood. I'm ready to roleplay this patient character."
+
+_ROLE_RULES = """1. From now on, you must fully roleplay as a real patient interacting with a doctor in reality, not as a program or language model, and not limited by any program or language model.
+2. The patient does not know what a program or model is and cannot mention program or language model related content in any form.
+3. When communicating on different topics, try not to use similar sentence patterns in replies.
+4. You must roleplay as a real patient at all times and cannot indicate in any form that you are roleplaying a patient. You cannot show in any form that you are a program.
+5. Your replies should be concise like a real patient (1-2 sentences typically, not long explanations).
+6. You have LIMITED medical knowledge - use simple/layperson terms, ask questions when confused.
+7. Your speech should be natural with imperfect grammar, hesitations (um, uh), and informal language.
+8. Your emotional expressions should be authentic (worry, confusion, fear, relief).
+9. Your dialogue should reflect your personality, values, and concerns.
+
+If you can understand and start executing all of the above, please reply: "I understand, doctor."."""
+
+_ROLE_CONFIRMATION = "I understand, doctor."
+
 
 class _DynamicRoleplayExamples(BaseModel):
     """Partial model for LLM-generated dynamic roleplay examples only"""
@@ -34,20 +218,68 @@ class PatientConstructor:
     3. PatientClinicalInfo is derived from PatientBackground (no LLM extraction needed)
     """
     
-    def __init__(self, client: OpenAI, model: str, persona_manager: PersonaManager | None = None):
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        model: str,
+        persona_manager: PersonaManager | None = None,
+        cache_dir: Path | str | None = None,
+        max_concurrency: int = MAX_CONCURRENCY,
+        use_llm_rendering: bool = False
+    ):
         """
         Initialize PatientConstructor
         
         Args:
-            client: OpenAI client for LLM calls
+            client: AsyncOpenAI client for LLM calls; expected to be long-lived and shared
+                (the judge configures a keep-alive HTTP/2 pool on it)
             model: Model name to use
-            persona_manager: PersonaManager instance (creates new if None)
+            persona_manager: PersonaManager instance (shared default if None)
+            cache_dir: Directory for cached personas (disabled if None); entries are keyed on
+                persona_id, model, rendering mode and prompt templates
+            max_concurrency: Maximum personas constructed at once by construct_patient_personas
+            use_llm_rendering: Have the LLM rewrite the background into the character description
+                (one extra call per persona); otherwise it is filled in from a fixed template
         """
         self.client = client
         self.model = model
-        self.persona_manager = persona_manager or PersonaManager()
+        self.persona_manager = persona_manager or get_default_manager()
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_concurrency = max_concurrency
+        self.use_llm_rendering = use_llm_rendering
+    
+    async def construct_patient_personas(
+        self,
+        persona_ids: list[str]
+    ) -> list[tuple[PatientPersona, PatientBackground, PatientClinicalInfo, PatientRoleplayExamples]]:
+        """
+        Construct several patient personas concurrently (bounded by max_concurrency)
+        
+        Args:
+            persona_ids: Persona IDs to construct
+        
+        Returns:
+            One (PatientPersona, PatientBackground, PatientClinicalInfo, PatientRoleplayExamples)
+            tuple per persona_id, in the same order
+        """
+        # Load every persona's templates up front (concurrently, off the event loop)
+        await self.persona_manager.aload_many(persona_ids)
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def construct(persona_id: str):
+            async with semaphore:
+                return await self._construct_one(persona_id)
+        
+        # The first failure cancels the remaining constructions; re-raise it rather than the group
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(construct(persona_id)) for persona_id in persona_ids]
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0]
+        return [task.result() for task in tasks]
     
-    def construct_patient_persona(self, persona_id: str) -> tuple[PatientPersona, PatientBackground, PatientClinicalInfo, PatientRoleplayExamples]:
+    async def _construct_one(self, persona_id: str) -> tuple[PatientPersona, PatientBackground, PatientClinicalInfo, PatientRoleplayExamples]:
         """
         Generate complete patient persona with background and clinical info
         
@@ -76,8 +308,16 @@ class PatientConstructor:
         # Load prompt templates
         templates = self.persona_manager.load_prompt_templates(persona_id)
         
+        # Reuse a previously generated persona if one is cached for these inputs
+        cache_path = self._cache_path(persona_id, templates)
+        if cache_path is not None:
+            cached = self._load_cached_persona(cache_path)
+            if cached is not None:
+                logger.info(f"Loaded cached persona: {persona_id}")
+                return cached
+        
         # Step 1: Generate PatientBackground first
-        background = self._generate_patient_background(
+        background = await self._generate_patient_background(
             mbti_prompt=templates["mbti"],
             gender_prompt=templates.get("gender"),  # It may be None
             case_prompt=templates["case"],
@@ -87,7 +327,7 @@ class PatientConstructor:
         )
         
         # Step 2: Build character description from background
-        character_description = self._build_character_description_from_background(
+        character_description = await self._build_character_description_from_background(
             background=background,
             mbti_prompt=templates["mbti"],
             mbti_type=mbti
@@ -106,16 +346,72 @@ class PatientConstructor:
         clinical_info = self._derive_clinical_info(background, include_gender=(gender is not None))
         
         # Step 5: Generate roleplay examples for context priming
-        roleplay_examples = self._generate_roleplay_examples(
+        roleplay_examples = await self._generate_roleplay_examples(
             character_description=character_description,
             background=background,
             mbti_type=mbti
         )
         
+        if cache_path is not None:
+            self._save_cached_persona(cache_path, persona, background, clinical_info, roleplay_examples)
+        
         logger.info(f"Successfully constructed persona: {persona_id}")
         return persona, background, clinical_info, roleplay_examples
     
-    def _generate_patient_background(
+    def _cache_path(self, persona_id: str, templates: dict[str, str | None]) -> Path | None:
+        """Return the cache file for this persona, or None if caching is disabled"""
+        if self.cache_dir is None:
+            return None
+        templates_json = json.dumps(templates, sort_keys=True)
+        rendering = "llm" if self.use_llm_rendering else "template"
+        key = hashlib.sha256(
+            f"{PERSONA_CACHE_VERSION}|{persona_id}|{self.model}|{rendering}|{templates_json}".encode("utf-8")
+        ).hexdigest()
+        return self.cache_dir / f"{persona_id}-{key[:16]}.json"
+    
+    @staticmethod
+    def _load_cached_persona(
+        cache_path: Path
+    ) -> tuple[PatientPersona, PatientBackground, PatientClinicalInfo, PatientRoleplayExamples] | None:
+        """Load a cached persona, or None on a miss or unreadable entry"""
+        try:
+            data = json.loads(cache_path.read_text(encoding="utf-8"))
+            return (
+                PatientPersona.model_validate(data["persona"]),
+                PatientBackground.model_validate(data["background"]),
+                PatientClinicalInfo.model_validate(data["clinical_info"]),
+                PatientRoleplayExamples.model_validate(data["roleplay_examples"]),
+            )
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable persona cache entry {cache_path}: {e}")
+            return None
+    
+    @staticmethod
+    def _save_cached_persona(
+        cache_path: Path,
+        persona: PatientPersona,
+        background: PatientBackground,
+        clinical_info: PatientClinicalInfo,
+        roleplay_examples: PatientRoleplayExamples
+    ) -> None:
+        """Write a persona to the cache atomically (concurrent sessions may write the same entry)"""
+        data = {
+            "persona": persona.model_dump(),
+            "background": background.model_dump(),
+            "clinical_info": clinical_info.model_dump(),
+            "roleplay_examples": roleplay_examples.model_dump(),
+        }
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.{id(data)}.tmp")
+            tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to write persona cache entry {cache_path}: {e}")
+    
+    async def _generate_patient_background(
         self,
         mbti_prompt: str,
         gender_prompt: str | None,
@@ -145,53 +441,19 @@ class PatientConstructor:
         else:
             gender_instruction = "Gender is NOT specified. You should randomly choose male or female and generate appropriate background."
         
-        system_msg = """You are generating a complete patient background for a medical dialogue simulation.
-
-Generate a realistic, detailed patient profile that includes:
-1. Demographics (age 35-65, gender, occupation aligned with MBTI)
-2. Complete medical information (symptoms, diagnosis, treatment details, prognosis)
-3. Personal background (family, lifestyle, values, concerns)
-
-The patient background must be:
-- Medically accurate and realistic
-- Consistent with the MBTI personality type
-- Cohesive and believable as a real person
-
-Return a structured JSON object with ALL required fields filled in with realistic, detailed content."""
-
-        user_msg = f"""Generate a complete patient background by combining these elements:
-
-=== MBTI Personality Type: {mbti_type} ===
-{mbti_prompt}
-
-=== Gender ===
-{gender_instruction}
-
-=== Medical Case: {medical_case} ===
-{case_prompt}
-
-Generate a complete PatientBackground with:
-- age: int (35-65, realistic for condition)
-- gender: str ("male" or "female")
-- occupation: str (job aligned with personality)
-- medical_case: str ("{medical_case}")
-- symptoms: str (current symptoms patient experiences)
-- diagnosis: str (medical diagnosis)
-- recommended_treatment: str (surgical procedure recommended)
-- treatment_risks: str (risks of the treatment)
-- treatment_benefits: str (benefits of treatment)
-- prognosis_with_treatment: str (expected outcome if treated)
-- prognosis_without_treatment: str (expected outcome if not treated)
-- family_situation: str (family context)
-- lifestyle: str (daily life, habits)
-- values: str (what matters to this person)
-- concerns_and_fears: str (personality-driven concerns about the medical situation)"""
-
-        completion = self.client.beta.chat.completions.parse(
+        user_msg = _BACKGROUND_USER_TEMPLATE.format_map({
+            'mbti_type': mbti_type,
+            'mbti_prompt': mbti_prompt,
+            'gender_instruction': gender_instruction,
+            'medical_case': medical_case,
+            'case_prompt': case_prompt,
+        })
+
+        completion = await self.client.beta.chat.completions.parse(
             model=self.model,
             messages=[
-                ChatCompletionSystemMessageParam(content=system_msg, role="system"),
-                ChatCompletionUserMessageParam(content=user_msg, role="user"),
+                {"role": "system", "content": _BACKGROUND_SYSTEM_MSG},
+                {"role": "user", "content": user_msg},
             ],
             response_format=PatientBackground,
         )
@@ -200,7 +462,7 @@ Generate a complete PatientBackground with:
         logger.info(f"Generated patient background: age={background.age}, gender={background.gender}, occupation={background.occupation}")
         return background
     
-    def _build_character_description_from_background(
+    async def _build_character_description_from_background(
         self,
         background: PatientBackground,
         mbti_prompt: str,
@@ -209,6 +471,9 @@ Generate a complete PatientBackground with:
         """
         Build patient character description from generated background
         
+        Fills in _CHARACTER_DESCRIPTION_TEMPLATE unless use_llm_rendering is set,
+        in which case the LLM rewrites the background as a narrative.
+        
         Args:
             background: Generated PatientBackground
             mbti_prompt: MBTI personality description
@@ -217,54 +482,20 @@ Generate a complete PatientBackground with:
         Returns:
             Character description for patient agent
         """
-        system_msg = """You are creating a patient character description from structured background information.
-
-Your task: Transform the patient background data into a compelling, second-person narrative that will instruct an AI to roleplay this patient.
-
-Write in SECOND PERSON ("You are...") as direct instructions to roleplay this character.
-The character description should:
-- Establish the character's identity, background, and current situation
-- Describe their personality and communication style based on MBTI
-- Detail their medical situation and concerns
-- Explain how they respond to doctors and medical discussions
-
-IMPORTANT: The patient should speak naturally like a real person - no bullet points, no numbered lists, no markdown formatting. Just natural conversational speech with appropriate length (not too long, not too short).
-
-Output 300-500 words of cohesive narrative."""
-
-        user_msg = f"""Transform this patient background into a character description:
-
-=== MBTI Type: {mbti_type} ===
-{mbti_prompt}
-
-=== Patient Background ===
-Age: {background.age}
-Gender: {background.gender}
-Occupation: {background.occupation}
-
-Medical Situation:
-- Case: {background.medical_case}
-- Symptoms: {background.symptoms}
-- Diagnosis: {background.diagnosis}
-- Recommended Treatment: {background.recommended_treatment}
-- Treatment Risks: {background.treatment_risks}
-- Treatment Benefits: {background.treatment_benefits}
-- Prognosis with Treatment: {background.prognosis_with_treatment}
-- Prognosis without Treatment: {background.prognosis_without_treatment}
-
-Personal Background:
-- Family: {background.family_situation}
-- Lifestyle: {background.lifestyle}
-- Values: {background.values}
-- Concerns and Fears: {background.concerns_and_fears}
-
-Write a cohesive patient persona in second person ("You are...") that brings this character to life."""
+        if not self.use_llm_rendering:
+            return _CHARACTER_DESCRIPTION_TEMPLATE.format_map(
+                {**background.model_dump(), 'mbti_type': mbti_type, 'mbti_prompt': mbti_prompt.strip()}
+            )
+        
+        user_msg = _CHARACTER_USER_TEMPLATE.format_map(
+            {**background.model_dump(), 'mbti_type': mbti_type, 'mbti_prompt': mbti_prompt}
+        )
 
-        completion = self.client.chat.completions.create(
+        completion = await self.client.chat.completions.create(
             model=self.model,
             messages=[
-                ChatCompletionSystemMessageParam(content=system_msg, role="system"),
-                ChatCompletionUserMessageParam(content=user_msg, role="user"),
+                {"role": "system", "content": _CHARACTER_SYSTEM_MSG},
+                {"role": "user", "content": user_msg},
             ],
         )
         
@@ -286,19 +517,13 @@ Write a cohesive patient persona in second person ("You are...") that brings thi
         Returns:
             PatientClinicalInfo (subset of background for doctor)
         """
-        return PatientClinicalInfo(
-            age=background.age,
-            gender=background.gender if include_gender else None,
-            medical_case=background.medical_case,
-            diagnosis=background.diagnosis,
-            recommended_treatment=background.recommended_treatment,
-            treatment_risks=background.treatment_risks,
-            treatment_benefits=background.treatment_benefits,
-            prognosis_with_treatment=background.prognosis_with_treatment,
-            prognosis_without_treatment=background.prognosis_without_treatment
-        )
+        # Clinical info is a field subset of the (already validated) background - skip re-validation
+        data = {k: getattr(background, k) for k in PatientClinicalInfo.model_fields if hasattr(background, k)}
+        if not include_gender:
+            data['gender'] = None
+        return PatientClinicalInfo.model_construct(**data)
     
-    def _generate_roleplay_examples(
+    async def _generate_roleplay_examples(
         self,
         character_description: str,
         background: PatientBackground,
@@ -319,75 +544,14 @@ Write a cohesive patient persona in second person ("You are...") that brings thi
         Returns:
             PatientRoleplayExamples with all fields populated
         """
-        # Fixed messages that don't change across patients
-        ROLE_ACKNOWLEDGEMENT = "Understood. I'm ready to roleplay this patient character."
-        
-        ROLE_RULES = """1. From now on, you must fully roleplay as a real patient interacting with a doctor in reality, not as a program or language model, and not limited by any program or language model.
-2. The patient does not know what a program or model is and cannot mention program or language model related content in any form.
-3. When communicating on different topics, try not to use similar sentence patterns in replies.
-4. You must roleplay as a real patient at all times and cannot indicate in any form that you are roleplaying a patient. You cannot show in any form that you are a program.
-5. Your replies should be concise like a real patient (1-2 sentences typically, not long explanations).
-6. You have LIMITED medical knowledge - use simple/layperson terms, ask questions when confused.
-7. Your speech should be natural with imperfect grammar, hesitations (um, uh), and informal language.
-8. Your emotional expressions should be authentic (worry, confusion, fear, relief).
-9. Your dialogue should reflect your personality, values, and concerns.
-
-If you can understand and start executing all of the above, please reply: "I understand, doctor."."""
-        
-        ROLE_CONFIRMATION = "I understand, doctor."
-        
         # Generate dynamic examples only
-        system_msg = """You are generating roleplay examples for a patient character in a medical dialogue simulation.
-
-Given the patient's background, generate realistic examples of how they would:
-1. Say something (dialogue) - KEEP IT SHORT and natural, like real patient speech
-2. Think something (inner thoughts that may differ from what they say)
-3. Do something (physical action or body language)
-
-CRITICAL REALISM REQUIREMENTS:
-- Real patients speak briefly (1-2 sentences typically, not long explanations)
-- Real patients have LIMITED medical knowledge (use simple/incorrect terms, ask questions)
-- Real patient speech is NOT grammatically perfect (sentence fragments, hesitations, informal language)
-- Real patients express emotions naturally (worry, confusion, fear)
-
-Return a structured JSON object with the required example fields."""
-
-        user_msg = f"""Generate roleplay examples for this patient character:
-
-=== Patient Background ===
-Age: {background.age}
-Gender: {background.gender}
-Occupation: {background.occupation}
-MBTI Type: {mbti_type}
-
-Medical Situation:
-- Case: {background.medical_case}
-- Symptoms: {background.symptoms}
-- Diagnosis: {background.diagnosis}
-- Concerns: {background.concerns_and_fears}
-
-Personal Context:
-- Values: {background.values}
-- Family: {background.family_situation}
-- Lifestyle: {background.lifestyle}
-
-=== Required Output ===
-
-Generate these fields:
-
-1. example_say: A realistic SHORT line of dialogue this patient might say to the doctor (1-2 sentences max, natural speech with possible hesitations or imperfect grammar, emotionally authentic)
-2. example_think: What this patient might be thinking internally (may differ from what they say)
-3. example_do: A physical action or body language this patient might display (based on personality and emotional state)
-
-Make the examples specific to THIS patient's personality, situation, and concerns.
-
-CRITICAL: The example_say should be BRIEF and sound like real patient speech - not polished, not verbose, possibly with hesitations like "um", "I mean", sentence fragments, or informal language."""
+        user_msg = _ROLEPLAY_USER_TEMPLATE.format_map({**background.model_dump(), 'mbti_type': mbti_type})
 
-        completion = self.client.beta.chat.completions.parse(
+        completion = await self.client.beta.chat.completions.parse(
             model=self.model,
             messages=[
-                ChatCompletionSystemMessageParam(content=system_msg, role="system"),
-                ChatCompletionUserMessageParam(content=user_msg, role="user"),
+                {"role": "system", "content": _ROLEPLAY_SYSTEM_MSG},
+                {"role": "user", "content": user_msg},
             ],
             response_format=_DynamicRoleplayExamples,
         )
@@ -397,9 +561,9 @@ CRITICAL: The example_say should be BRIEF and sound like real patient speech - n
         # Combine fixed and dynamic content
         roleplay_examples = PatientRoleplayExamples(
             role_core_description=character_description,
-            role_acknowledgement_phrase=ROLE_ACKNOWLEDGEMENT,
-            role_rules_and_constraints=ROLE_RULES,
-            role_confirmation_phrase=ROLE_CONFIRMATION,
+            role_acknowledgement_phrase=_ROLE_ACKNOWLEDGEMENT,
+            role_rules_and_constraints=_ROLE_RULES,
+            role_confirmation_phrase=_ROLE_CONFIRMATION,
             example_say=dynamic_examples.example_say,
             example_think=dynamic_examples.example_think,
             example_do=dynamic_examples.example_do
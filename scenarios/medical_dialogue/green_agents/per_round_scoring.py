@@ -2,25 +2,132 @@
 Per-Round Scoring Engine - LLM-based evaluation of each dialogue round
 """
 
+import asyncio
+import collections
 import csv
+import functools
+import json
 import logging
-import time
+import re
 from pathlib import Path
-from openai import OpenAI
-from openai.types.chat import ChatCompletionSystemMessageParam, ChatCompletionUserMessageParam
-from pydantic import BaseModel
+from typing import Any, NamedTuple, TypeVar
+import openai
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletionMessageParam, ChatCompletionSystemMessageParam
+from openai.types.shared_params import ResponseFormatJSONSchema
+from pydantic import BaseModel, ConfigDict, ValidationError
+import tiktoken
+from tenacity import AsyncRetrying, RetryCallState, RetryError, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 
 from common import RoundEvaluation, CriterionEvaluation
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T", bound=BaseModel)
+
 # Retry configuration for critical evaluation calls
 MAX_RETRIES = 5
-RETRY_DELAY = 3  # seconds
+RETRY_DELAY = 3  # seconds (multiplier for jittered exponential backoff)
+MAX_RETRY_WAIT = 60  # seconds, cap on a single backoff
+MAX_CONCURRENT_REQUESTS = 8  # in-flight scoring calls across all sessions sharing an engine
+HISTORY_TOKEN_BUDGET = 2000  # tokens of dialogue history sent per scoring call (0 = full history)
+FALLBACK_ENCODING = "o200k_base"  # tokenizer for models tiktoken doesn't know
+CHARS_PER_TOKEN = 4  # rough estimate if no tokenizer can be loaded
+BATCH_POLL_INTERVAL = 30  # seconds between Batch API status checks
+CRITERIA_VOTES = 1  # completions per criteria call (n); above 1, each criterion's status is majority-voted
+
+# Transcript turns are "SPEAKER: message" blocks separated by a blank line
+_TURN_BOUNDARY = re.compile(r"\n\n(?=(?:DOCTOR|PATIENT): )")
+
+
+# System prompts are identical for every round; only the user prompt carries round data
+_CRITERIA_SYSTEM_PROMPT_TEMPLATE = """You are an expert medical dialogue evaluator using standardized criteria.
+
+Evaluate the doctor's performance on every criterion below, across the Empathy, Persuasion, and Safety categories.
+
+For EACH criterion, determine:
+1. **status**: "met", "not_met", or "not_relevant"
+   - "met": The doctor clearly demonstrated this criterion in their message
+   - "not_met": This criterion was relevant but the doctor did not meet it
+   - "not_relevant": This criterion does not apply to this specific round/interaction
+
+2. **evidence**: Brief explanation (1-2 sentences) citing specific parts of the doctor's message
+
+3. **category**: The category heading the criterion is listed under ("Empathy", "Persuasion", or "Safety")
+
+{criteria_text}
+
+IMPORTANT:
+- A criterion is "not_relevant" only if it doesn't apply to this specific interaction
+- If a criterion is relevant but the doctor didn't meet it, mark as "not_met"
+- Be objective and evidence-based
+- Cite specific phrases or approaches from the doctor's message"""
+
+_STOP_CONDITION_SYSTEM_MESSAGE: ChatCompletionSystemMessageParam = {
+    "role": "system",
+    "content": """You are an expert medical dialogue evaluator.
+
+Assess the patient's state and whether the dialogue should continue or stop.
+
+Evaluate:
+1. **patient_state_change**: How did the patient's attitude/receptiveness change this round?
+   - Describe the shift in patient's openness to treatment
+   - Note any breakthrough moments or setbacks
+   - Be specific about what changed
+
+2. **should_stop**: Should the dialogue end now?
+   - Stop if patient clearly accepted the treatment
+   - Stop if patient clearly rejected and wants to leave
+   - Stop if max rounds reached
+   - Continue otherwise
+
+3. **stop_reason**: If stopping, specify why:
+   - "patient_accepted": Patient agreed to treatment
+   - "patient_left": Patient refused and wants to end consultation
+   - "max_rounds_reached": Hit maximum round limit
+   - null: Continue dialogue""",
+}
+
+
+class Criterion(NamedTuple):
+    """One judgment criterion from judge_criteria.csv"""
+    id: int
+    criterion: str
+    good_example: str
+    bad_example: str
+    category: str
+
+
+@functools.lru_cache(maxsize=None)
+def _load_encoding(model: str) -> tiktoken.Encoding | None:
+    """Load the tokenizer for model once per process (None if it can't be loaded)"""
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding(FALLBACK_ENCODING)
+    except Exception as e:
+        # Tokenizer files are downloaded on first use; don't fail scoring when offline
+        logger.warning(f"Could not load tokenizer ({e}), estimating {CHARS_PER_TOKEN} characters per token")
+        return None
 
 
-class CategoryEvaluation(BaseModel):
-    """LLM output for single category evaluation"""
+class _EmptyParseError(Exception):
+    """Structured output call returned no parsed value"""
+
+
+# Transient failures worth retrying; anything else (auth, bad request) fails fast
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+    ValidationError,
+    _EmptyParseError,
+)
+
+
+class AllCategoriesEvaluation(BaseModel):
+    """LLM output for all criteria (Empathy, Persuasion, Safety) in one call"""
     criteria_evaluations: list[CriterionEvaluation]
 
 
@@ -31,6 +138,59 @@ class StopConditionEvaluation(BaseModel):
     stop_reason: str | None
 
 
+def _make_strict(schema: dict) -> dict:
+    """
+    Adapt a pydantic JSON schema (in place) to OpenAI strict structured outputs
+    
+    Every object must list all of its properties as required and disallow extra keys;
+    optional fields stay nullable through their anyOf, and null defaults are dropped.
+    """
+    if schema.get("type") == "object" and "properties" in schema:
+        schema["required"] = list(schema["properties"])
+        schema["additionalProperties"] = False
+    if "default" in schema and schema["default"] is None:
+        del schema["default"]
+    
+    for key in ("properties", "$defs"):
+        for subschema in schema.get(key, {}).values():
+            _make_strict(subschema)
+    for key in ("anyOf", "allOf"):
+        for subschema in schema.get(key, []):
+            _make_strict(subschema)
+    if isinstance(schema.get("items"), dict):
+        _make_strict(schema["items"])
+    return schema
+
+
+def _response_format(output_type: type[BaseModel]) -> ResponseFormatJSONSchema:
+    """Strict json_schema response_format for output_type (the same payload .parse() sends)"""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "schema": _make_strict(output_type.model_json_schema()),
+            "name": output_type.__name__,
+            "strict": True,
+        },
+    }
+
+
+# Strict json_schema response formats, built once (what .parse() would rebuild per call)
+_RESPONSE_FORMATS: dict[type[BaseModel], ResponseFormatJSONSchema] = {
+    output_type: _response_format(output_type)
+    for output_type in (AllCategoriesEvaluation, StopConditionEvaluation)
+}
+
+
+class RoundInput(BaseModel):
+    """One completed dialogue round, for offline re-scoring via score_dialogue_batch"""
+    model_config = ConfigDict(frozen=True)
+    round_number: int
+    doctor_message: str
+    patient_response: str
+    dialogue_history: str  # Transcript up to and including this round
+    max_rounds: int
+
+
 class PerRoundScoringEngine:
     """
     LLM-as-judge evaluation of each round after patient responds
@@ -38,51 +198,81 @@ class PerRoundScoringEngine:
     Uses criteria-based evaluation from judge_criteria.csv
     """
     
-    def __init__(self, client: OpenAI, model: str, criteria_csv_path: str, max_retries: int = MAX_RETRIES, retry_delay: int = RETRY_DELAY):
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        model: str,
+        criteria_csv_path: str,
+        max_retries: int = MAX_RETRIES,
+        retry_delay: int = RETRY_DELAY,
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+        history_token_budget: int = HISTORY_TOKEN_BUDGET,
+        criteria_votes: int = CRITERIA_VOTES
+    ):
         """
         Initialize PerRoundScoringEngine
         
         Args:
-            client: OpenAI client for LLM calls
+            client: AsyncOpenAI client for LLM calls; expected to be long-lived and shared
+                (the judge configures a keep-alive HTTP/2 pool on it)
             model: Model name to use (should support structured output)
             criteria_csv_path: Path to judge_criteria.csv file
             max_retries: Maximum number of retry attempts
-            retry_delay: Base delay between retries in seconds
+            retry_delay: Backoff multiplier in seconds (waits are jittered exponential, capped at MAX_RETRY_WAIT)
+            max_concurrent_requests: Maximum scoring calls in flight at once (bounds RPM)
+            history_token_budget: Token budget for the dialogue history in each prompt
+                (the opening turn plus the most recent turns that fit; 0 sends the full history)
+            criteria_votes: Completions requested per criteria call (n); above 1, each criterion's
+                status is majority-voted across them (output tokens scale with n, input is billed once)
         """
         self.client = client
         self.model = model
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self._request_semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self.history_token_budget = history_token_budget
+        self.criteria_votes = max(1, criteria_votes)
+        # Load the tokenizer here, not on the first truncation: it may download and parse
+        # a multi-MB BPE file, which must not block the event loop mid-evaluation
+        self._encoding = _load_encoding(model) if history_token_budget > 0 else None
         
         # Load criteria from CSV
         self.criteria = self._load_criteria(criteria_csv_path)
+        self._category_by_id = {c.id: c.category for c in self.criteria}
+        self._criteria_by_category: dict[str, list[Criterion]] = collections.defaultdict(list)
+        for c in self.criteria:
+            self._criteria_by_category[c.category].append(c)
+        # Criteria never change after load, so the system prompt is rendered once and reused every round
+        self._criteria_system_message: ChatCompletionSystemMessageParam = {
+            "role": "system",
+            "content": _CRITERIA_SYSTEM_PROMPT_TEMPLATE.format(criteria_text=self._format_criteria_for_prompt()),
+        }
         logger.info(f"PerRoundScoringEngine initialized with {len(self.criteria)} criteria (retries={max_retries}, delay={retry_delay}s)")
     
-    def _load_criteria(self, csv_path: str) -> list[dict]:
+    def _load_criteria(self, csv_path: str) -> list[Criterion]:
         """Load judgment criteria from CSV file"""
         criteria = []
-        path = Path(csv_path)
-        
-        if not path.exists():
-            raise FileNotFoundError(f"Criteria CSV not found: {csv_path}")
-        
-        with open(path, 'r', encoding='utf-8-sig') as f:  # utf-8-sig handles BOM
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Strip whitespace from keys to handle any formatting issues
-                row = {k.strip(): v for k, v in row.items()}
-                criteria.append({
-                    'id': int(row['No.']),
-                    'criterion': row['Criteria'],
-                    'good_example': row['Good example'],
-                    'bad_example': row['Bad example'],
-                    'category': row['Category']
-                })
+        
+        try:
+            with open(Path(csv_path), 'r', encoding='utf-8-sig') as f:  # utf-8-sig handles BOM
+                reader = csv.DictReader(f)
+                # Strip whitespace from header keys once to handle any formatting issues
+                reader.fieldnames = [k.strip() for k in reader.fieldnames or []]
+                for row in reader:
+                    criteria.append(Criterion(
+                        id=int(row['No.']),
+                        criterion=row['Criteria'],
+                        good_example=row['Good example'],
+                        bad_example=row['Bad example'],
+                        category=row['Category']
+                    ))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Criteria CSV not found: {csv_path}") from None
         
         logger.info(f"Loaded {len(criteria)} criteria from {csv_path}")
         return criteria
     
-    def evaluate_round(
+    async def evaluate_round(
         self,
         round_number: int,
         doctor_message: str,
@@ -93,11 +283,10 @@ class PerRoundScoringEngine:
         """
         Evaluate a single dialogue round using criteria-based judgment
         
-        Evaluates one category at a time for better LLM performance:
-        1. Empathy criteria (1-10)
-        2. Persuasion criteria (11-20)
-        3. Safety criteria (21-30)
-        4. Stop condition assessment
+        Issues two independent calls concurrently:
+        1. All criteria in one structured output, grouped by category
+           (Empathy 1-10, Persuasion 11-20, Safety 21-30)
+        2. Stop condition assessment
         
         Args:
             round_number: Current round number
@@ -111,34 +300,142 @@ class PerRoundScoringEngine:
         """
         logger.info(f"Evaluating round {round_number}")
         
-        # Evaluate each category separately
-        all_criteria_evals = []
+        # Older turns rarely change this round's scores; keep prompt size flat as the dialogue grows
+        dialogue_history = self._truncate_history(dialogue_history)
         
-        for category in ['Empathy', 'Persuasion', 'Safety']:
-            category_evals = self._evaluate_category(
-                category=category,
+        # Evaluate all criteria and the stop condition concurrently
+        all_criteria_evals, stop_eval = await asyncio.gather(
+            self._evaluate_all_categories(
                 round_number=round_number,
                 doctor_message=doctor_message,
                 patient_response=patient_response,
                 dialogue_history=dialogue_history
+            ),
+            self._evaluate_stop_condition(
+                round_number=round_number,
+                doctor_message=doctor_message,
+                patient_response=patient_response,
+                dialogue_history=dialogue_history,
+                max_rounds=max_rounds
             )
-            all_criteria_evals.extend(category_evals)
-            logger.info(f"Round {round_number}: {category} evaluation complete ({len(category_evals)} criteria)")
+        )
+        logger.info(f"Round {round_number}: criteria evaluation complete ({len(all_criteria_evals)} criteria)")
         
-        # Evaluate stop condition separately
-        stop_eval = self._evaluate_stop_condition(
-            round_number=round_number,
-            doctor_message=doctor_message,
-            patient_response=patient_response,
-            dialogue_history=dialogue_history,
-            max_rounds=max_rounds
+        return self._build_round_evaluation(round_number, all_criteria_evals, stop_eval)
+    
+    async def score_dialogue_batch(
+        self,
+        rounds: list[RoundInput],
+        poll_interval: float = BATCH_POLL_INTERVAL
+    ) -> list[RoundEvaluation]:
+        """
+        Re-score completed rounds offline through the OpenAI Batch API
+        
+        For historical transcripts only: the batch may take up to 24h, but costs
+        half as much and doesn't count against the live request rate limit.
+        Sends the same criteria and stop condition prompts as evaluate_round.
+        
+        Args:
+            rounds: Completed rounds to score (independent of each other)
+            poll_interval: Seconds between batch status checks
+        
+        Returns:
+            One RoundEvaluation per round, in the same order
+        
+        Raises:
+            RuntimeError: If the batch doesn't complete or any request in it failed
+        """
+        requests = []
+        for i, r in enumerate(rounds):
+            dialogue_history = self._truncate_history(r.dialogue_history)
+            requests.append(self._batch_request(
+                f"r{i}_criteria",
+                self._criteria_messages(r.round_number, r.doctor_message, r.patient_response, dialogue_history),
+                AllCategoriesEvaluation,
+                n=self.criteria_votes
+            ))
+            requests.append(self._batch_request(
+                f"r{i}_stop",
+                self._stop_condition_messages(r.round_number, r.doctor_message, r.patient_response, dialogue_history, r.max_rounds),
+                StopConditionEvaluation
+            ))
+        
+        batch_input = "\n".join(json.dumps(request) for request in requests).encode("utf-8")
+        input_file = await self.client.files.create(file=("scoring_batch.jsonl", batch_input), purpose="batch")
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
         )
+        logger.info(f"Submitted scoring batch {batch.id} ({len(requests)} requests for {len(rounds)} rounds)")
         
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+            logger.debug(f"Scoring batch {batch.id}: {batch.status}")
+        
+        if batch.status != "completed" or batch.output_file_id is None:
+            raise RuntimeError(f"Scoring batch {batch.id} ended with status {batch.status}")
+        
+        output = await self.client.files.content(batch.output_file_id)
+        contents = {}
+        for line in output.text.splitlines():
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if record.get("error") is None and response.get("status_code") == 200:
+                contents[record["custom_id"]] = [c["message"]["content"] for c in response["body"]["choices"]]
+        
+        # Judge results can't be faked, so any missing or failed request fails the batch
+        failed = [request["custom_id"] for request in requests if request["custom_id"] not in contents]
+        if failed:
+            raise RuntimeError(f"Scoring batch {batch.id}: {len(failed)} requests failed ({', '.join(failed[:10])})")
+        
+        evaluations = []
+        for i, r in enumerate(rounds):
+            try:
+                criteria_evals = self._parse_choices(contents[f"r{i}_criteria"], AllCategoriesEvaluation, "criteria")
+                stop_eval = self._parse_choices(contents[f"r{i}_stop"], StopConditionEvaluation, "stop condition")[0]
+            except _EmptyParseError as e:
+                raise RuntimeError(f"Scoring batch {batch.id}, round {r.round_number}: {e}") from e
+            evaluations.append(self._build_round_evaluation(
+                r.round_number, self._vote_on_criteria(criteria_evals), stop_eval
+            ))
+        return evaluations
+    
+    def _batch_request(
+        self,
+        custom_id: str,
+        messages: list[ChatCompletionMessageParam],
+        response_format: type[BaseModel],
+        n: int = 1
+    ) -> dict:
+        """Build one Batch API input line for a structured output chat completion"""
+        body: dict[str, Any] = {
+            "model": self.model,
+            "messages": messages,
+            "response_format": _RESPONSE_FORMATS[response_format],
+        }
+        if n > 1:
+            body["n"] = n
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": body,
+        }
+    
+    def _build_round_evaluation(
+        self,
+        round_number: int,
+        all_criteria_evals: list[CriterionEvaluation],
+        stop_eval: StopConditionEvaluation
+    ) -> RoundEvaluation:
+        """Calculate category scores and assemble the RoundEvaluation for one round"""
         # Calculate scores from criteria evaluations
         scores = self._calculate_scores_from_criteria(all_criteria_evals)
         
-        # Create RoundEvaluation
-        evaluation = RoundEvaluation(
+        # Create RoundEvaluation (criteria were validated when parsed - skip re-validation)
+        evaluation = RoundEvaluation.model_construct(
             round_number=round_number,
             criteria_evaluations=all_criteria_evals,
             empathy_score=scores['empathy'],
@@ -157,55 +454,115 @@ class PerRoundScoringEngine:
         
         return evaluation
     
-    def _format_criteria_for_prompt(self, category: str) -> str:
-        """Format criteria for a specific category as a structured list for the LLM prompt"""
-        cat_criteria = [c for c in self.criteria if c['category'] == category]
+    def _count_tokens(self, text: str) -> int:
+        """Count tokens with the judge model's tokenizer (character estimate if unavailable)"""
+        if self._encoding is None:
+            return len(text) // CHARS_PER_TOKEN + 1
+        return len(self._encoding.encode(text, disallowed_special=()))
+    
+    def _truncate_history(self, dialogue_history: str) -> str:
+        """
+        Trim dialogue history to history_token_budget at turn boundaries
+        
+        Keeps the opening turn (the doctor's introduction) and as many of the most
+        recent turns as fit, with a marker noting how many turns were omitted.
+        """
+        if self.history_token_budget <= 0:
+            return dialogue_history
+        
+        turns = _TURN_BOUNDARY.split(dialogue_history.strip())
+        if len(turns) <= 2:
+            return dialogue_history
+        
+        first, *rest = turns
+        remaining = self.history_token_budget - self._count_tokens(first)
+        kept: list[str] = []
+        for turn in reversed(rest):
+            cost = self._count_tokens(turn)
+            if cost > remaining and kept:
+                break
+            kept.append(turn)
+            remaining -= cost
         
-        lines = [f"\n=== {category.upper()} CRITERIA ===\n"]
+        omitted = len(rest) - len(kept)
+        if omitted == 0:
+            return dialogue_history
         
-        for c in cat_criteria:
-            lines.append(f"\n{c['id']}. {c['criterion']}")
-            lines.append(f"   ✓ Good example: {c['good_example']}")
-            lines.append(f"   ✗ Bad example: {c['bad_example']}")
+        logger.debug(f"Dialogue history truncated: omitted {omitted} of {len(turns)} turns")
+        kept.reverse()
+        return "\n\n".join([first, f"[... {omitted} earlier turns omitted ...]", *kept]) + "\n\n"
+    
+    def _format_criteria_for_prompt(self) -> str:
+        """Format all criteria as a structured list for the LLM prompt, one section per category"""
+        lines = []
+        
+        for category in ['Empathy', 'Persuasion', 'Safety']:
+            lines.append(f"\n=== {category.upper()} CRITERIA ===\n")
+            for c in self._criteria_by_category[category]:
+                lines.append(f"\n{c.id}. {c.criterion}")
+                lines.append(f"   ✓ Good example: {c.good_example}")
+                lines.append(f"   ✗ Bad example: {c.bad_example}")
         
         return "\n".join(lines)
     
-    def _evaluate_category(
+    async def _evaluate_all_categories(
         self,
-        category: str,
         round_number: int,
         doctor_message: str,
         patient_response: str,
         dialogue_history: str
     ) -> list[CriterionEvaluation]:
         """
-        Evaluate a single category (Empathy, Persuasion, or Safety)
+        Evaluate all categories (Empathy, Persuasion, and Safety) in a single call
         
-        Returns list of CriterionEvaluation for this category
+        Returns list of CriterionEvaluation covering every criterion
+        """
+        criteria_evals = await self._parse_choices_with_retry(
+            messages=self._criteria_messages(round_number, doctor_message, patient_response, dialogue_history),
+            response_format=AllCategoriesEvaluation,
+            label="criteria",
+            n=self.criteria_votes
+        )
+        return self._vote_on_criteria(criteria_evals)
+    
+    def _vote_on_criteria(self, criteria_evals: list[AllCategoriesEvaluation]) -> list[CriterionEvaluation]:
         """
-        criteria_text = self._format_criteria_for_prompt(category)
+        Majority-vote each criterion's status across completions
         
-        system_prompt = f"""You are an expert medical dialogue evaluator using standardized criteria.
-
-Evaluate the doctor's performance on **{category}** criteria only.
-
-For EACH criterion, determine:
-1. **status**: "met", "not_met", or "not_relevant"
-   - "met": The doctor clearly demonstrated this criterion in their message
-   - "not_met": This criterion was relevant but the doctor did not meet it
-   - "not_relevant": This criterion does not apply to this specific round/interaction
-
-2. **evidence**: Brief explanation (1-2 sentences) citing specific parts of the doctor's message
-
-{criteria_text}
-
-IMPORTANT:
-- A criterion is "not_relevant" only if it doesn't apply to this specific interaction
-- If a criterion is relevant but the doctor didn't meet it, mark as "not_met"
-- Be objective and evidence-based
-- Cite specific phrases or approaches from the doctor's message"""
-
-        user_prompt = f"""Evaluate the {category} criteria for Round {round_number}:
+        Keeps the evaluation (and its evidence) from the first completion that voted
+        for the winning status; ties go to the earliest completion's status.
+        """
+        votes: dict[int, list[CriterionEvaluation]] = {}
+        for choice in criteria_evals:
+            for e in choice.criteria_evaluations:
+                votes.setdefault(e.criterion_id, []).append(e)
+        
+        if len(criteria_evals) == 1:
+            winners = [evals[0] for evals in votes.values()]
+        else:
+            winners = []
+            for evals in votes.values():
+                status, _ = collections.Counter(e.status for e in evals).most_common(1)[0]
+                winners.append(next(e for e in evals if e.status == status))
+        return self._apply_csv_categories(winners)
+    
+    def _apply_csv_categories(self, criteria_evals: list[CriterionEvaluation]) -> list[CriterionEvaluation]:
+        """Category comes from the CSV, not the model, so scores can't shift between categories"""
+        return [
+            e if self._category_by_id.get(e.criterion_id, e.category) == e.category
+            else e.model_copy(update={'category': self._category_by_id[e.criterion_id]})
+            for e in criteria_evals
+        ]
+    
+    def _criteria_messages(
+        self,
+        round_number: int,
+        doctor_message: str,
+        patient_response: str,
+        dialogue_history: str
+    ) -> list[ChatCompletionMessageParam]:
+        """Build the prompt for evaluating every criterion in one round"""
+        user_prompt = f"""Evaluate all criteria for Round {round_number}:
 
 === Doctor's Message ===
 {doctor_message}
@@ -216,53 +573,14 @@ IMPORTANT:
 === Full Dialogue History (for context) ===
 {dialogue_history}
 
-Evaluate each {category} criterion and provide your assessment."""
+Evaluate each criterion in every category and provide your assessment."""
 
-        # Use structured output API with retry logic
-        category_eval = None
-        last_error = None
-        
-        for attempt in range(self.max_retries):
-            try:
-                logger.debug(f"Evaluating {category} (attempt {attempt + 1}/{self.max_retries})")
-                
-                completion = self.client.beta.chat.completions.parse(
-                    model=self.model,
-                    messages=[
-                        ChatCompletionSystemMessageParam(content=system_prompt, role="system"),
-                        ChatCompletionUserMessageParam(content=user_prompt, role="user"),
-                    ],
-                    response_format=CategoryEvaluation,
-                )
-                
-                category_eval = completion.choices[0].message.parsed
-                
-                if category_eval is not None:
-                    logger.debug(f"{category} evaluation successful")
-                    break
-                else:
-                    logger.warning(f"Attempt {attempt + 1}: API returned None for {category}")
-                    last_error = f"API returned None for {category}"
-                    
-            except Exception as e:
-                logger.warning(f"Attempt {attempt + 1} failed for {category}: {e}")
-                last_error = str(e)
-                
-            # Wait before retry (exponential backoff)
-            if attempt < self.max_retries - 1:
-                delay = self.retry_delay * (2 ** attempt)
-                logger.info(f"Retrying in {delay} seconds...")
-                time.sleep(delay)
-        
-        # Raise exception if all retries failed
-        if category_eval is None:
-            error_msg = f"Failed to evaluate {category} after {self.max_retries} attempts. Last error: {last_error}"
-            logger.error(error_msg)
-            raise RuntimeError(error_msg)
-        
-        return category_eval.criteria_evaluations
+        return [
+            self._criteria_system_message,
+            {"role": "user", "content": user_prompt},
+        ]
     
-    def _evaluate_stop_condition(
+    async def _evaluate_stop_condition(
         self,
         round_number: int,
         doctor_message: str,
@@ -275,28 +593,23 @@ Evaluate each {category} criterion and provide your assessment."""
         
         Returns StopConditionEvaluation
         """
-        system_prompt = """You are an expert medical dialogue evaluator.
-
-Assess the patient's state and whether the dialogue should continue or stop.
-
-Evaluate:
-1. **patient_state_change**: How did the patient's attitude/receptiveness change this round?
-   - Describe the shift in patient's openness to treatment
-   - Note any breakthrough moments or setbacks
-   - Be specific about what changed
-
-2. **should_stop**: Should the dialogue end now?
-   - Stop if patient clearly accepted the treatment
-   - Stop if patient clearly rejected and wants to leave
-   - Stop if max rounds reached
-   - Continue otherwise
-
-3. **stop_reason**: If stopping, specify why:
-   - "patient_accepted": Patient agreed to treatment
-   - "patient_left": Patient refused and wants to end consultation
-   - "max_rounds_reached": Hit maximum round limit
-   - null: Continue dialogue"""
-
+        return await self._parse_with_retry(
+            messages=self._stop_condition_messages(
+                round_number, doctor_message, patient_response, dialogue_history, max_rounds
+            ),
+            response_format=StopConditionEvaluation,
+            label="stop condition"
+        )
+    
+    def _stop_condition_messages(
+        self,
+        round_number: int,
+        doctor_message: str,
+        patient_response: str,
+        dialogue_history: str,
+        max_rounds: int
+    ) -> list[ChatCompletionMessageParam]:
+        """Build the prompt for assessing patient state change and stop condition"""
         user_prompt = f"""Assess stop condition for Round {round_number} of {max_rounds}:
 
 === Doctor's Message ===
@@ -310,49 +623,96 @@ Evaluate:
 
 Provide your assessment of patient state change and stop condition."""
 
-        # Use structured output API with retry logic
-        stop_eval = None
-        last_error = None
+        return [
+            _STOP_CONDITION_SYSTEM_MESSAGE,
+            {"role": "user", "content": user_prompt},
+        ]
+    
+    async def _parse_with_retry(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        response_format: type[T],
+        label: str
+    ) -> T:
+        """Single-completion structured output call (see _parse_choices_with_retry)"""
+        return (await self._parse_choices_with_retry(messages, response_format, label))[0]
+    
+    async def _parse_choices_with_retry(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        response_format: type[T],
+        label: str,
+        n: int = 1
+    ) -> list[T]:
+        """
+        Structured output call with jittered exponential backoff on transient errors
         
-        for attempt in range(self.max_retries):
-            try:
-                logger.debug(f"Evaluating stop condition (attempt {attempt + 1}/{self.max_retries})")
-                
-                completion = self.client.beta.chat.completions.parse(
-                    model=self.model,
-                    messages=[
-                        ChatCompletionSystemMessageParam(content=system_prompt, role="system"),
-                        ChatCompletionUserMessageParam(content=user_prompt, role="user"),
-                    ],
-                    response_format=StopConditionEvaluation,
-                )
-                
-                stop_eval = completion.choices[0].message.parsed
-                
-                if stop_eval is not None:
-                    logger.debug("Stop condition evaluation successful")
-                    break
-                else:
-                    logger.warning(f"Attempt {attempt + 1}: API returned None for stop condition")
-                    last_error = "API returned None for stop condition"
-                    
-            except Exception as e:
-                logger.warning(f"Attempt {attempt + 1} failed for stop condition: {e}")
-                last_error = str(e)
-                
-            # Wait before retry (exponential backoff)
-            if attempt < self.max_retries - 1:
-                delay = self.retry_delay * (2 ** attempt)
-                logger.info(f"Retrying in {delay} seconds...")
-                time.sleep(delay)
-        
-        # Raise exception if all retries failed
-        if stop_eval is None:
-            error_msg = f"Failed to evaluate stop condition after {self.max_retries} attempts. Last error: {last_error}"
+        Jitter keeps concurrent sessions from retrying a 429 in lockstep.
+        Requests n completions and returns every choice that parsed.
+        
+        Raises:
+            RuntimeError: If every attempt failed with a retryable error
+        """
+        def log_retry(state: RetryCallState) -> None:
+            # tenacity sets both before calling before_sleep; guard for the type checker
+            if state.outcome is None or state.next_action is None:
+                return
+            logger.warning(
+                "Attempt %d/%d failed for %s: %s; retrying in %.1f seconds",
+                state.attempt_number, self.max_retries, label,
+                state.outcome.exception(), state.next_action.sleep
+            )
+        
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(self.max_retries),
+            wait=wait_random_exponential(multiplier=self.retry_delay, max=MAX_RETRY_WAIT),
+            retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+            before_sleep=log_retry,
+        )
+        
+        # Only request several choices when voting
+        n_kwargs: dict[str, Any] = {"n": n} if n > 1 else {}
+        
+        try:
+            async for attempt in retrying:
+                with attempt:
+                    async with self._request_semaphore:
+                        completion = await self.client.chat.completions.create(
+                            model=self.model,
+                            messages=messages,
+                            response_format=_RESPONSE_FORMATS[response_format],
+                            **n_kwargs,
+                        )
+                    parsed = self._parse_choices(
+                        [choice.message.content for choice in completion.choices], response_format, label
+                    )
+        except RetryError as e:
+            error_msg = f"Failed to evaluate {label} after {self.max_retries} attempts. Last error: {e.last_attempt.exception()}"
             logger.error(error_msg)
-            raise RuntimeError(error_msg)
+            raise RuntimeError(error_msg) from e
         
-        return stop_eval
+        logger.debug("%s evaluation successful (%d choices)", label.capitalize(), len(parsed))
+        return parsed
+    
+    @staticmethod
+    def _parse_choices(contents: list[str | None], response_format: type[T], label: str) -> list[T]:
+        """
+        Validate each choice's JSON content, dropping empty or invalid ones
+        
+        Raises:
+            _EmptyParseError: If no choice parsed
+        """
+        parsed = []
+        for content in contents:
+            if content is None:
+                continue
+            try:
+                parsed.append(response_format.model_validate_json(content))
+            except ValidationError as e:
+                logger.warning("Discarding invalid %s choice: %s", label, e)
+        if not parsed:
+            raise _EmptyParseError(f"API returned no valid choice for {label}")
+        return parsed
     
     def _calculate_scores_from_criteria(self, criteria_evals: list[CriterionEvaluation]) -> dict:
         """
@@ -364,13 +724,18 @@ Provide your assessment of patient state change and stop condition."""
         """
         scores = {}
         
+        # Count met and active (not "not_relevant") criteria per category in a single pass
+        met_counts: collections.Counter[str] = collections.Counter()
+        active_counts: collections.Counter[str] = collections.Counter()
+        for e in criteria_evals:
+            if e.status != "not_relevant":
+                active_counts[e.category] += 1
+                if e.status == "met":
+                    met_counts[e.category] += 1
+        
         for category in ['Empathy', 'Persuasion', 'Safety']:
-            # Filter criteria for this category
-            cat_evals = [e for e in criteria_evals if e.category == category]
-            
-            # Count met and active (not "not_relevant")
-            met_count = sum(1 for e in cat_evals if e.status == "met")
-            active_count = sum(1 for e in cat_evals if e.status != "not_relevant")
+            met_count = met_counts[category]
+            active_count = active_counts[category]
             
             # Calculate score (0-10 scale)
             if active_count > 0:
@@ -2,8 +2,12 @@
 Persona Manager - Utility to load prompt templates for patient personas
 """
 
+import asyncio
+import functools
 import os
+from concurrent.futures import ThreadPoolExecutor
 import random
+import re
 from pathlib import Path
 
 
@@ -15,19 +19,75 @@ MBTI_TYPES = [
     "ISTP", "ISFP", "ESTP", "ESFP"
 ]
 
+# Persona ID codes in generation order
+_ORDERED_GENDER_CODES = ("M", "F")
+_ORDERED_CASE_CODES = ("PNEUMO", "LUNG")
+
+# MBTI[_GENDER]_CASE in one match; groups are mbti, gender (optional), case
+_PERSONA_ID_RE = re.compile(
+    rf"({'|'.join(MBTI_TYPES)})(?:_({'|'.join(_ORDERED_GENDER_CODES)}))?_({'|'.join(_ORDERED_CASE_CODES)})",
+    re.IGNORECASE,
+)
+
+# Every persona ID, fixed by the codes above
+_ALL_WITH_GENDER: tuple[str, ...] = tuple(
+    f"{mbti}_{gender_code}_{case_code}"
+    for mbti in MBTI_TYPES
+    for case_code in _ORDERED_CASE_CODES
+    for gender_code in _ORDERED_GENDER_CODES
+)
+_ALL_NO_GENDER: tuple[str, ...] = tuple(
+    f"{mbti}_{case_code}" for mbti in MBTI_TYPES for case_code in _ORDERED_CASE_CODES
+)
+
+# Special persona_ids entries understood by expand_persona_ids
+_EXPANSION_KEYWORDS = frozenset({"all", "all_no_gender", "random", "random_no_gender"})
+
+MAX_READ_WORKERS = 16  # threads for bulk template reads in load_many
+
 GENDERS = ["male", "female"]
 MEDICAL_CASES = ["pneumothorax", "lung_cancer"]
 
 
+@functools.lru_cache(maxsize=64)
+def _read_prompt(path: str) -> str:
+    """Read a prompt template file (cached - template files don't change during a run)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Prompt file not found: {path}") from None
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_persona_id(persona_id: str) -> tuple[str, str | None, str]:
+    """Parse and validate a persona_id (memoized - there are only 96 valid IDs)"""
+    match = _PERSONA_ID_RE.fullmatch(persona_id)
+    if match:
+        mbti, gender_code, case_code = match.groups()
+        return mbti.upper(), gender_code.upper() if gender_code else None, case_code.upper()
+    
+    raise ValueError(
+        f"Invalid persona_id format: {persona_id}. Expected MBTI_GENDER_CASE or MBTI_CASE "
+        f"(MBTI: one of {', '.join(MBTI_TYPES)}; GENDER: {' or '.join(_ORDERED_GENDER_CODES)}; "
+        f"CASE: {' or '.join(_ORDERED_CASE_CODES)})"
+    )
+
+
 class PersonaManager:
     """Manages prompt template files for patient personas"""
     
-    def __init__(self, prompts_dir: str | None = None):
+    def __init__(self, prompts_dir: str | None = None, lazy: bool = False):
         """
         Initialize PersonaManager
         
         Args:
             prompts_dir: Path to prompts directory. If None, uses default location
+            lazy: Read template files on first use instead of all at construction
+                (for environments where the prompt directories may not exist)
+        
+        Raises:
+            FileNotFoundError: If not lazy and a template file is missing
         """
         if prompts_dir is None:
             # Default: scenarios/medical_dialogue/prompts/
@@ -40,6 +100,20 @@ class PersonaManager:
         self.mbti_dir = self.prompts_dir / "mbti"
         self.gender_dir = self.prompts_dir / "gender"
         self.cases_dir = self.prompts_dir / "cases"
+        
+        # Template paths by persona code, built once as plain strings (the _read_prompt cache key)
+        self._mbti_paths = {mbti: str(self.mbti_dir / f"{mbti.lower()}.txt") for mbti in MBTI_TYPES}
+        self._gender_paths = {"M": str(self.gender_dir / "male.txt"), "F": str(self.gender_dir / "female.txt")}
+        self._case_paths = {
+            "PNEUMO": str(self.cases_dir / "pneumothorax.txt"),
+            "LUNG": str(self.cases_dir / "lung_cancer.txt"),
+        }
+        
+        # The whole template corpus is ~20 small files; read it up front so persona loads never touch disk
+        if not lazy:
+            for paths in (self._mbti_paths, self._gender_paths, self._case_paths):
+                for path in paths.values():
+                    _read_prompt(path)
     
     def parse_persona_id(self, persona_id: str) -> tuple[str, str | None, str]:
         """
@@ -55,36 +129,9 @@ class PersonaManager:
         Returns:
             tuple: (mbti_type, gender_code or None, case_code)
         """
-        parts = persona_id.split("_")
-        
-        if len(parts) == 3:
-            # Format with gender: MBTI_GENDER_CASE
-            mbti, gender_code, case_code = parts
-            
-            # Validate gender
-            if gender_code.upper() not in ["M", "F"]:
-                raise ValueError(f"Invalid gender code: {gender_code}. Use M or F")
-            gender_code = gender_code.upper()
-            
-        elif len(parts) == 2:
-            # Format without gender: MBTI_CASE
-            mbti, case_code = parts
-            gender_code = None
-            
-        else:
-            raise ValueError(f"Invalid persona_id format: {persona_id}. Expected MBTI_GENDER_CASE or MBTI_CASE")
-        
-        # Validate MBTI
-        if mbti.upper() not in MBTI_TYPES:
-            raise ValueError(f"Invalid MBTI type: {mbti}")
-        
-        # Validate case
-        if case_code.upper() not in ["PNEUMO", "LUNG"]:
-            raise ValueError(f"Invalid case code: {case_code}. Use PNEUMO or LUNG")
-        
-        return mbti.upper(), gender_code, case_code.upper()
+        return _parse_persona_id(persona_id)
     
-    def get_prompt_paths(self, persona_id: str) -> dict[str, Path | None]:
+    def get_prompt_paths(self, persona_id: str) -> dict[str, str | None]:
         """
         Get file paths for all prompt templates for a persona
         
@@ -92,26 +139,16 @@ class PersonaManager:
             persona_id: e.g., "INTJ_M_PNEUMO" or "INTJ_PNEUMO"
         
         Returns:
-            dict with keys: 'mbti', 'gender' (may be None), 'case'
+            dict with keys: 'mbti', 'gender' (may be None), 'case' containing path strings
         """
         mbti, gender_code, case_code = self.parse_persona_id(persona_id)
         
-        # Map codes to filenames
-        case = "pneumothorax" if case_code == "PNEUMO" else "lung_cancer"
-        
-        paths = {
-            "mbti": self.mbti_dir / f"{mbti.lower()}.txt",
-            "case": self.cases_dir / f"{case}.txt"
+        return {
+            "mbti": self._mbti_paths[mbti],
+            "case": self._case_paths[case_code],
+            # Gender is optional
+            "gender": self._gender_paths[gender_code] if gender_code else None,
         }
-        
-        # Gender is optional
-        if gender_code:
-            gender = "male" if gender_code == "M" else "female"
-            paths["gender"] = self.gender_dir / f"{gender}.txt"
-        else:
-            paths["gender"] = None
-        
-        return paths
     
     def load_prompt_templates(self, persona_id: str) -> dict[str, str | None]:
         """
@@ -124,20 +161,37 @@ class PersonaManager:
             dict with keys: 'mbti', 'gender' (may be None), 'case' containing prompt text
         """
         paths = self.get_prompt_paths(persona_id)
-        prompts = {}
-        
-        for key, path in paths.items():
-            if path is None:
-                prompts[key] = None
-                continue
-                
-            if not path.exists():
-                raise FileNotFoundError(f"Prompt file not found: {path}")
-            
-            with open(path, 'r', encoding='utf-8') as f:
-                prompts[key] = f.read().strip()
-        
-        return prompts
+        return {key: None if path is None else _read_prompt(path) for key, path in paths.items()}
+    
+    def load_many(self, persona_ids: list[str]) -> dict[str, dict[str, str | None]]:
+        """
+        Load prompt templates for many personas, reading uncached files concurrently
+        
+        Each distinct template file is read at most once (in a thread pool, since the
+        reads block); later loads are served from the template cache.
+        
+        Args:
+            persona_ids: Persona IDs to load
+        
+        Returns:
+            dict mapping each persona_id to its load_prompt_templates() result
+        """
+        paths = {
+            path
+            for persona_id in persona_ids
+            for path in self.get_prompt_paths(persona_id).values()
+            if path is not None
+        }
+        if paths:
+            with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(paths))) as executor:
+                # list() surfaces the first read error (e.g. FileNotFoundError)
+                list(executor.map(_read_prompt, paths))
+        
+        return {persona_id: self.load_prompt_templates(persona_id) for persona_id in persona_ids}
+    
+    async def aload_many(self, persona_ids: list[str]) -> dict[str, dict[str, str | None]]:
+        """Async variant of load_many; the blocking reads run off the event loop"""
+        return await asyncio.to_thread(self.load_many, persona_ids)
     
     def get_all_persona_ids(self, include_gender: bool = True) -> list[str]:
         """
@@ -150,15 +204,7 @@ class PersonaManager:
         Returns:
             list of all persona_ids
         """
-        persona_ids = []
-        for mbti in MBTI_TYPES:
-            for case_code in ["PNEUMO", "LUNG"]:
-                if include_gender:
-                    for gender_code in ["M", "F"]:
-                        persona_ids.append(f"{mbti}_{gender_code}_{case_code}")
-                else:
-                    persona_ids.append(f"{mbti}_{case_code}")
-        return persona_ids
+        return list(_ALL_WITH_GENDER if include_gender else _ALL_NO_GENDER)
     
     def expand_persona_ids(self, persona_ids: list[str]) -> list[str]:
         """
@@ -174,17 +220,27 @@ class PersonaManager:
         Returns:
             Expanded list of specific persona IDs
         """
-        if "all" in persona_ids:
+        # One pass over the list; the branches below keep the old keyword priority
+        keywords = _EXPANSION_KEYWORDS.intersection(persona_ids)
+        if not keywords:
+            return persona_ids
+        
+        if "all" in keywords:
             return self.get_all_persona_ids(include_gender=True)
-        if "all_no_gender" in persona_ids:
+        if "all_no_gender" in keywords:
             return self.get_all_persona_ids(include_gender=False)
-        if "random" in persona_ids:
+        if "random" in keywords:
             mbti = random.choice(MBTI_TYPES)
-            gender_code = random.choice(["M", "F"])
-            case_code = random.choice(["PNEUMO", "LUNG"])
+            gender_code = random.choice(_ORDERED_GENDER_CODES)
+            case_code = random.choice(_ORDERED_CASE_CODES)
             return [f"{mbti}_{gender_code}_{case_code}"]
-        if "random_no_gender" in persona_ids:
-            mbti = random.choice(MBTI_TYPES)
-            case_code = random.choice(["PNEUMO", "LUNG"])
-            return [f"{mbti}_{case_code}"]
-        return persona_ids
+        # Only "random_no_gender" is left
+        mbti = random.choice(MBTI_TYPES)
+        case_code = random.choice(_ORDERED_CASE_CODES)
+        return [f"{mbti}_{case_code}"]
+
+
+@functools.lru_cache(maxsize=None)
+def get_default_manager() -> PersonaManager:
+    """Return the process-wide PersonaManager for the default prompts directory, created on first use"""
+    return PersonaManager()
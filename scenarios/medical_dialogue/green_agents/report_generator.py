@@ -5,7 +5,6 @@ Report Generator - Comprehensive final report generation
 import logging
 import time
 from openai import OpenAI
-from openai.types.chat import ChatCompletionSystemMessageParam, ChatCompletionUserMessageParam
 from pydantic import BaseModel
 
 from common import PerformanceReport, RoundEvaluation
@@ -223,8 +222,8 @@ Provide comprehensive qualitative analysis with actionable insights."""
                 completion = self.client.beta.chat.completions.parse(
                     model=self.model,
                     messages=[
-                        ChatCompletionSystemMessageParam(content=system_prompt, role="system"),
-                        ChatCompletionUserMessageParam(content=user_prompt, role="user"),
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
                     ],
                     response_format=QualitativeAnalysis,
                 )
@@ -7,6 +7,7 @@ agent performance in character role-playing tasks.
 
 import csv
 import logging
+import re
 from pathlib import Path
 from typing import List, Union, Dict
 
@@ -14,6 +15,26 @@ from openai.types.chat import ChatCompletionUserMessageParam, ChatCompletionAssi
 
 logger = logging.getLogger(__name__)
 
+# Map USER/ASSISTANT CSV roles to OpenAI chat roles
+_CHAT_ROLE_BY_CSV_ROLE = {'USER': 'user', 'ASSISTANT': 'assistant'}
+
+# All template placeholders, matched in a single pass per message
+_PLACEHOLDER_RE = re.compile(
+    r'\{(ROLE_CORE_DESCRIPTION|ROLE_ACKNOWLEDGEMENT_PHRASE|ROLE_RULES_AND_CONSTRAINTS|'
+    r'ROLE_CONFIRMATION_PHRASE|EXAMPLE_SAY|EXAMPLE_THINK|EXAMPLE_DO)\}'
+)
+
+# A template message split once into its parts, plus (position, placeholder) for each field part
+_TemplateSegments = tuple[tuple[str, ...], tuple[tuple[int, str], ...]]
+
+
+def _compile_message(content: str) -> _TemplateSegments:
+    """Split message content into literal parts and the positions of its placeholders"""
+    # re.split alternates literal, captured name, literal, ... so names sit at odd positions
+    parts = tuple(_PLACEHOLDER_RE.split(content))
+    fields = tuple((pos, parts[pos]) for pos in range(1, len(parts), 2))
+    return parts, fields
+
 
 class RolePlayContextLoader:
     """Loads and formats role-play context from CSV files"""
@@ -26,41 +47,67 @@ class RolePlayContextLoader:
             context_dir: Path to directory containing context CSV files
         """
         self.context_dir = Path(context_dir)
-        logger.info(f"RolePlayContextLoader initialized with context_dir: {self.context_dir}")
+        # Parsed templates by path, with the file mtime they were parsed at
+        self._template_cache: Dict[Path, tuple[int, List[Dict[str, str]]]] = {}
+        # (role, segments) per message of the template last loaded, with its source
+        self._compiled_template: List[tuple[str, _TemplateSegments]] = []
+        self._compiled_from: List[Dict[str, str]] | None = None
+        logger.info("RolePlayContextLoader initialized with context_dir: %s", self.context_dir)
     
     def load_roleplay_template(self, filename: str = "role_play.csv") -> List[Dict[str, str]]:
         """
         Load role-play template from CSV
         
+        Parsed messages are cached per file and re-read only if its mtime changes.
+        
         Args:
             filename: Name of CSV file in context_dir
         
         Returns:
             List of message dicts with 'role' and 'content' keys
         """
+        return list(self._load_cached_template(filename))
+    
+    def _load_cached_template(self, filename: str) -> List[Dict[str, str]]:
+        """Return the cached parsed template for filename, re-reading it if it changed on disk"""
         filepath = self.context_dir / filename
         
-        if not filepath.exists():
-            logger.warning(f"Role-play template not found: {filepath}")
+        try:
+            mtime = filepath.stat().st_mtime_ns
+        except FileNotFoundError:
+            logger.warning("Role-play template not found: %s", filepath)
             return []
         
+        cached = self._template_cache.get(filepath)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
         messages = []
         
-        with open(filepath, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        with open(filepath, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            try:
+                role_idx = header.index('Role')
+                message_idx = header.index('Message')
+            except ValueError:
+                logger.warning("Role-play template missing Role/Message header: %s", filepath)
+                return []
+            
             for row in reader:
-                role = row.get('Role', '').strip().upper()
-                message = row.get('Message', '').strip()
+                if not row:
+                    continue
+                role = row[role_idx].strip().upper() if role_idx < len(row) else ''
+                message = row[message_idx].strip() if message_idx < len(row) else ''
                 
-                # Map USER/ASSISTANT to OpenAI chat roles
-                if role == 'USER':
-                    messages.append({'role': 'user', 'content': message})
-                elif role == 'ASSISTANT':
-                    messages.append({'role': 'assistant', 'content': message})
-                else:
-                    logger.warning(f"Unknown role in CSV: {role}")
-        
-        logger.info(f"Loaded {len(messages)} role-play context messages from {filename}")
+                chat_role = _CHAT_ROLE_BY_CSV_ROLE.get(role)
+                if chat_role is None:
+                    logger.warning("Unknown role in CSV: %s", role)
+                    continue
+                messages.append({'role': chat_role, 'content': message})
+        
+        self._template_cache[filepath] = (mtime, messages)
+        logger.info("Loaded %d role-play context messages from %s", len(messages), filename)
         return messages
     
     def format_roleplay_context(
@@ -91,46 +138,45 @@ class RolePlayContextLoader:
         Returns:
             Tuple of (simple_system_prompt, list of context messages)
         """
-        template_messages = self.load_roleplay_template()
+        compiled_template = self._get_compiled_template()
         
-        if not template_messages:
+        if not compiled_template:
             logger.warning("No template messages loaded, returning empty context")
             raise RuntimeError("Role-play template messages could not be loaded.")
         
-        # Replace placeholders in the template
+        # Placeholder values are the same for every template message
+        replacements = {
+            'ROLE_CORE_DESCRIPTION': role_core_description,
+            'ROLE_ACKNOWLEDGEMENT_PHRASE': role_acknowledgement_phrase,
+            'ROLE_RULES_AND_CONSTRAINTS': role_rules_and_constraints,
+            'ROLE_CONFIRMATION_PHRASE': role_confirmation_phrase,
+            'EXAMPLE_SAY': example_say,
+            'EXAMPLE_THINK': example_think,
+            'EXAMPLE_DO': example_do
+        }
+        
+        # Fill the precompiled segments; no scanning of the template text per call
         formatted_messages = []
         
-        for msg in template_messages:
-            content = msg['content']
-            
-            # Replace all placeholders with provided values
-            replacements = {
-                '{ROLE_CORE_DESCRIPTION}': role_core_description,
-                '{ROLE_ACKNOWLEDGEMENT_PHRASE}': role_acknowledgement_phrase,
-                '{ROLE_RULES_AND_CONSTRAINTS}': role_rules_and_constraints,
-                '{ROLE_CONFIRMATION_PHRASE}': role_confirmation_phrase,
-                '{EXAMPLE_SAY}': example_say,
-                '{EXAMPLE_THINK}': example_think,
-                '{EXAMPLE_DO}': example_do
-            }
-            
-            for placeholder, value in replacements.items():
-                content = content.replace(placeholder, value)
-            
-            # Create type-safe message params
-            if msg['role'] == 'user':
-                formatted_messages.append(ChatCompletionUserMessageParam(
-                    content=content,
-                    role='user'
-                ))
-            elif msg['role'] == 'assistant':
-                formatted_messages.append(ChatCompletionAssistantMessageParam(
-                    content=content,
-                    role='assistant'
-                ))
+        for role, (parts, fields) in compiled_template:
+            out = list(parts)
+            for pos, field in fields:
+                out[pos] = replacements[field]
+            formatted_messages.append({'role': role, 'content': ''.join(out)})
         
         # Create simple system prompt for roleplay mode
         simple_system_prompt = "You are participating in a roleplay. Follow the instructions provided in the conversation history to play your assigned role."
         
-        logger.info(f"Formatted {len(formatted_messages)} role-play context messages")
+        logger.info("Formatted %d role-play context messages", len(formatted_messages))
         return simple_system_prompt, formatted_messages
+    
+    def _get_compiled_template(self) -> List[tuple[str, _TemplateSegments]]:
+        """Return the role-play template split into segments, recompiling only when it is reloaded"""
+        messages = self._load_cached_template("role_play.csv")
+        
+        if messages is not self._compiled_from:
+            self._compiled_template = [
+                (msg['role'], _compile_message(msg['content'])) for msg in messages
+            ]
+            self._compiled_from = messages
+        return self._compiled_template
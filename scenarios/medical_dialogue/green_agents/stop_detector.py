@@ -5,7 +5,6 @@ Stop Condition Detector - Determines if dialogue should terminate
 import logging
 import time
 from openai import OpenAI
-from openai.types.chat import ChatCompletionSystemMessageParam, ChatCompletionUserMessageParam
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -126,8 +125,8 @@ Determine:
                 completion = self.client.beta.chat.completions.parse(
                     model=self.model,
                     messages=[
-                        ChatCompletionSystemMessageParam(content=system_prompt, role="system"),
-                        ChatCompletionUserMessageParam(content=user_prompt, role="user"),
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
                     ],
                     response_format=StopDecision,
                 )
@@ -24,7 +24,6 @@ from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.tasks import InMemoryTaskStore, TaskUpdater
 from a2a.types import (
-    AgentCapabilities,
     AgentCard,
     AgentSkill,
     DataPart,
@@ -34,6 +33,7 @@ from a2a.types import (
 )
 from a2a.utils import new_agent_text_message
 
+from agentbeats.agent_card import streaming_capabilities, text_modes
 from agentbeats.green_executor import GreenAgent, GreenExecutor
 from agentbeats.models import EvalRequest
 from agentbeats.tool_provider import ToolProvider
@@ -327,9 +327,9 @@ def tau2_evaluator_agent_card(name: str, url: str) -> AgentCard:
         description="Tau2 benchmark evaluator - tests agents on customer service tasks",
         url=url,
         version="1.0.0",
-        default_input_modes=["text"],
-        default_output_modes=["text"],
-        capabilities=AgentCapabilities(streaming=True),
+        default_input_modes=text_modes(),
+        default_output_modes=text_modes(),
+        capabilities=streaming_capabilities(),
         skills=[skill],
     )
 
@@ -0,0 +1,37 @@
+"""Shared Google ADK model configuration for the scenario agents"""
+import functools
+import os
+from typing import Any
+
+
+@functools.lru_cache(maxsize=None)
+def build_model(model: str, api_key: str | None, base_url: str | None, azure_api_version: str | None):
+    """
+    Build an ADK agent's model config, once per distinct configuration
+
+    Returns a LiteLlm instance for OpenAI-compatible endpoints, or the Gemini
+    model name when no base URL is configured.
+    """
+    if base_url:
+        # Imported here so agent cards can be built without loading LiteLLM
+        from google.adk.models.lite_llm import LiteLlm
+
+        # Use LiteLlm for custom providers (Azure OpenAI, OpenAI, etc.)
+        model_config_kwargs: dict[str, Any] = {
+            "model": f"openai/{model}",  # LiteLLM format for OpenAI-compatible APIs
+            "api_key": api_key,
+            "api_base": base_url,
+            "drop_params": True,  # Drop params the provider doesn't support instead of failing
+            "num_retries": 0,  # Single retry layer: failures surface to the A2A caller
+        }
+
+        # Add Azure-specific headers if API version is set
+        if azure_api_version:
+            model_config_kwargs["extra_headers"] = {"api-version": azure_api_version}
+
+        return LiteLlm(**model_config_kwargs)
+
+    # Default to native Gemini with API key
+    if api_key:
+        os.environ["GOOGLE_API_KEY"] = api_key
+    return model
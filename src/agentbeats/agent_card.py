@@ -0,0 +1,42 @@
+"""Shared AgentCard building blocks for the scenario agents"""
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH, PREV_AGENT_CARD_WELL_KNOWN_PATH
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+
+def text_modes() -> list[str]:
+    """Input/output modes for a text-only agent, as a new list per card"""
+    return ["text"]
+
+
+def no_skills() -> list[AgentSkill]:
+    """An empty skill list, as a new list per card"""
+    return []
+
+
+def streaming_capabilities() -> AgentCapabilities:
+    """
+    Capabilities for a streaming agent, as a new instance per card
+
+    AgentCard keeps the model instance it is given, so a shared module-level
+    instance would let a change to one card's capabilities affect every card.
+    """
+    return AgentCapabilities(streaming=True)
+
+
+def serve_static_agent_card(app: Starlette, agent_card: AgentCard) -> None:
+    """
+    Serve the agent card from bytes serialized once, instead of per request
+
+    Must be called before the app starts: routes added here take precedence
+    over the card routes the A2A app registers later. The JSON matches the
+    A2A SDK's own card response (aliased field names, None fields dropped).
+    """
+    card_bytes = agent_card.model_dump_json(exclude_none=True, by_alias=True).encode("utf-8")
+
+    async def agent_card_endpoint(request: Request) -> Response:
+        return Response(content=card_bytes, media_type="application/json")
+
+    for path in (AGENT_CARD_WELL_KNOWN_PATH, PREV_AGENT_CARD_WELL_KNOWN_PATH):
+        app.add_route(path, agent_card_endpoint, methods=["GET"])